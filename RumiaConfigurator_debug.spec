@@ -6,7 +6,7 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('src\\assets', 'assets')],
-    hiddenimports=['gui', 'can_interface', 'plot_manager', 'utils', 'plotting', 'customtkinter', 'darkdetect', 'serial', 'serial.tools.list_ports', 'can', 'can.interfaces', 'can.interfaces.slcan', 'can.interfaces.virtual'],
+    hiddenimports=['gui', 'can_interface', 'plot_manager', 'utils', 'plotting', 'socketcan_backend', 'sdo_client', 'signal_graph', 'spectrum', 'rolling_stats', 'event_capture', 'chunk_store', 'offscreen_renderer', 'sample_stream', 'frame_decoders', 'traffic_monitor', 'slcan_probe', 'alarm_engine', 'csv_export', 'customtkinter', 'darkdetect', 'serial', 'serial.tools.list_ports', 'can', 'can.interfaces', 'can.interfaces.slcan', 'can.interfaces.virtual'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
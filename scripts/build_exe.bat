@@ -22,7 +22,7 @@ if not exist "src\assets\Rumia_logo.ico" (
 )
 
 REM Verifying required modules exist
-for %%F in (gui.py can_interface.py plot_manager.py utils.py plotting.py RumiaConfigurator.py) do (
+for %%F in (gui.py can_interface.py plot_manager.py utils.py plotting.py socketcan_backend.py sdo_client.py signal_graph.py spectrum.py rolling_stats.py event_capture.py chunk_store.py offscreen_renderer.py sample_stream.py frame_decoders.py traffic_monitor.py slcan_probe.py alarm_engine.py csv_export.py RumiaConfigurator.py) do (
     if not exist "src\%%F" (
         echo [ERROR] Missing module: src\%%F
         exit /b 1
@@ -62,6 +62,20 @@ pyinstaller ^
   --hidden-import plot_manager ^
   --hidden-import utils ^
   --hidden-import plotting ^
+  --hidden-import socketcan_backend ^
+  --hidden-import sdo_client ^
+  --hidden-import signal_graph ^
+  --hidden-import spectrum ^
+  --hidden-import rolling_stats ^
+  --hidden-import event_capture ^
+  --hidden-import chunk_store ^
+  --hidden-import offscreen_renderer ^
+  --hidden-import sample_stream ^
+  --hidden-import frame_decoders ^
+  --hidden-import traffic_monitor ^
+  --hidden-import slcan_probe ^
+  --hidden-import alarm_engine ^
+  --hidden-import csv_export ^
   --hidden-import customtkinter ^
   --hidden-import darkdetect ^
   --hidden-import serial ^
@@ -85,6 +99,20 @@ pyinstaller ^
   --hidden-import plot_manager ^
   --hidden-import utils ^
   --hidden-import plotting ^
+  --hidden-import socketcan_backend ^
+  --hidden-import sdo_client ^
+  --hidden-import signal_graph ^
+  --hidden-import spectrum ^
+  --hidden-import rolling_stats ^
+  --hidden-import event_capture ^
+  --hidden-import chunk_store ^
+  --hidden-import offscreen_renderer ^
+  --hidden-import sample_stream ^
+  --hidden-import frame_decoders ^
+  --hidden-import traffic_monitor ^
+  --hidden-import slcan_probe ^
+  --hidden-import alarm_engine ^
+  --hidden-import csv_export ^
   --hidden-import customtkinter ^
   --hidden-import darkdetect ^
   --hidden-import serial ^
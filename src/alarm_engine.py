@@ -0,0 +1,183 @@
+import csv
+import json
+import math
+
+import numpy as np
+from utils import CSV_TIMESTAMP_FORMAT
+
+ALARM_CSV_HEADER = ['Timestamp', 'CAN ID', 'Signal', 'Event', 'Value', 'Low', 'High']
+
+
+class AlarmRule:
+    """
+    Limits on one signal, with optional per-node overrides.
+    An alarm is raised when the value has been outside [low, high] for `debounce` seconds
+    and cleared once it is back inside the limits narrowed by `hysteresis`.
+    Per-node limits and state are kept in arrays indexed by node, so a chunk of samples
+    from all nodes is evaluated with a handful of NumPy operations.
+    """
+
+    def __init__(self, signal, low=None, high=None, hysteresis=0.0, debounce=0.0, nodes=None):
+        """
+        Args:
+            signal: raw or derived signal name (e.g. 'tetha_xz', 'x_acc')
+            low, high: limits (None for no limit on that side)
+            hysteresis: margin the value must move back inside the limits before clearing
+            debounce: seconds the limit must be exceeded before the alarm is raised
+            nodes: optional dict CAN ID -> dict overriding any of low/high/hysteresis/debounce
+        """
+        if low is None and high is None:
+            raise ValueError(f"Alarm on '{signal}' needs at least one limit.")
+        if low is not None and high is not None and low >= high:
+            raise ValueError(f"Alarm on '{signal}': low must be below high.")
+        self.signal = signal
+        self.defaults = {'low': low, 'high': high, 'hysteresis': hysteresis, 'debounce': debounce}
+        self.node_overrides = {can_id.upper(): dict(limits) for can_id, limits in (nodes or {}).items()}
+        self.low = np.empty(0)
+        self.high = np.empty(0)
+        self.hysteresis = np.empty(0)
+        self.debounce = np.empty(0, dtype=np.int64)
+        self.state = np.empty(0, dtype=bool)
+        self.run = np.empty(0, dtype=np.int64)
+        self.active = np.empty(0, dtype=bool)
+
+    def limits_for(self, can_id):
+        return {**self.defaults, **self.node_overrides.get(can_id.upper(), {})}
+
+    def add_node(self, can_id, fs):
+        """Append limits and cleared state for a newly seen node."""
+        limits = self.limits_for(can_id)
+        low = -math.inf if limits['low'] is None else float(limits['low'])
+        high = math.inf if limits['high'] is None else float(limits['high'])
+        self.low = np.append(self.low, low)
+        self.high = np.append(self.high, high)
+        self.hysteresis = np.append(self.hysteresis, abs(float(limits['hysteresis'])))
+        self.debounce = np.append(self.debounce, max(1, int(round(float(limits['debounce']) * fs))))
+        self.state = np.append(self.state, False)
+        self.run = np.append(self.run, 0)
+        self.active = np.append(self.active, False)
+
+
+def load_alarm_rules(path):
+    """
+    Load alarm rules from a JSON file:
+        {"rules": [{"signal": "tetha_xz", "low": -5, "high": 5, "hysteresis": 0.5,
+                    "debounce": 0.2, "nodes": {"19D": {"high": 3}}}]}
+    """
+    with open(path) as f:
+        config = json.load(f)
+    return [AlarmRule(**rule) for rule in config.get('rules', [])]
+
+
+class AlarmEngine:
+    """
+    Evaluates all alarm rules over each ingest chunk, for all nodes at once.
+    Samples are grouped by node with one stable sort; hysteresis state, debounce run
+    lengths and transitions are then computed with group-aware cumulative operations and
+    carried to the next chunk per node. Per-chunk cost depends on the number of samples,
+    not on the number of nodes.
+    """
+
+    def __init__(self, rules, fs, log_callback=None):
+        """
+        Args:
+            rules: list of AlarmRule
+            fs: per-node sampling frequency in Hz (converts debounce seconds to samples)
+            log_callback: optional function(message) called for every raise/clear
+        """
+        self.rules = list(rules)
+        self.fs = fs
+        self.log_callback = log_callback or print
+        self.events = []
+        self._nodes = {}
+        self._node_ids = []
+
+    def _node_index(self, can_id):
+        index = self._nodes.get(can_id)
+        if index is None:
+            index = self._nodes[can_id] = len(self._node_ids)
+            self._node_ids.append(can_id)
+            for rule in self.rules:
+                rule.add_node(can_id, self.fs)
+        return index
+
+    def process(self, points, chunk):
+        """
+        Evaluate one ingest chunk.
+        Args:
+            points: list of (timestamp, can_id, x, y, z)
+            chunk: dict of streaming signals for the same samples
+        Returns: list of new events (timestamp, can_id, signal, 'ALARM'/'CLEAR', value, low, high)
+        """
+        n = len(points)
+        if n == 0 or not self.rules:
+            return []
+        unique_ids, inverse = np.unique(np.array([p[1] for p in points]), return_inverse=True)
+        node = np.array([self._node_index(can_id) for can_id in unique_ids.tolist()])[inverse]
+        order = np.argsort(node, kind='stable')
+        g = node[order]
+        pos = np.arange(n)
+        starts = np.empty(n, dtype=bool)
+        starts[0] = True
+        starts[1:] = g[1:] != g[:-1]
+        ends = np.empty(n, dtype=bool)
+        ends[:-1] = starts[1:]
+        ends[-1] = True
+        # Position of the first sample of each sample's node group
+        group_start = np.maximum.accumulate(np.where(starts, pos, 0))
+
+        new_events = []
+        for rule in self.rules:
+            values = np.asarray(chunk[rule.signal], dtype=float)[order]
+            low, high, hyst = rule.low[g], rule.high[g], rule.hysteresis[g]
+            outside = (values > high) | (values < low)
+            inside = (values <= high - hyst) & (values >= low + hyst)
+
+            # Hysteresis: state follows the last outside/inside sample of the node, else the carried state
+            last_change = np.maximum.accumulate(np.where(outside | inside, pos, -1))
+            state = np.where(last_change >= group_start, outside[np.maximum(last_change, 0)], rule.state[g])
+
+            # Debounce: consecutive samples in state, continuing the run carried from the previous chunk
+            last_clear = np.maximum.accumulate(np.where(state, -1, pos))
+            run = np.where(last_clear >= group_start, pos - last_clear, pos - group_start + 1 + rule.run[g])
+            active = state & (run >= rule.debounce[g])
+
+            previous = np.empty(n, dtype=bool)
+            previous[1:] = active[:-1]
+            previous[starts] = rule.active[g[starts]]
+            for i in np.flatnonzero(active != previous).tolist():
+                p = points[order[i]]
+                node_low, node_high = float(low[i]), float(high[i])
+                event = (p[0], p[1], rule.signal, 'ALARM' if active[i] else 'CLEAR', float(values[i]),
+                         None if math.isinf(node_low) else node_low, None if math.isinf(node_high) else node_high)
+                new_events.append(event)
+
+            last_nodes = g[ends]
+            rule.state[last_nodes] = state[ends]
+            rule.run[last_nodes] = run[ends]
+            rule.active[last_nodes] = active[ends]
+
+        new_events.sort(key=lambda e: e[0])
+        for timestamp, can_id, signal, kind, value, low, high in new_events:
+            self.log_callback(
+                f"{'ALLARME' if kind == 'ALARM' else 'Rientro'} {can_id} {signal}={value:.3f} "
+                f"(limiti {low}, {high}) @ {timestamp.strftime('%H:%M:%S.%f')[:-3]}"
+            )
+        self.events.extend(new_events)
+        return new_events
+
+    def active_alarms(self):
+        """Return list of (can_id, signal) currently in alarm."""
+        return [
+            (self._node_ids[index], rule.signal)
+            for rule in self.rules for index in np.flatnonzero(rule.active).tolist()
+        ]
+
+    def export_csv(self, filename):
+        """Write every raise/clear event to a CSV file."""
+        with open(filename, 'w', newline='') as csvfile:
+            csv_writer = csv.writer(csvfile)
+            csv_writer.writerow(ALARM_CSV_HEADER)
+            for timestamp, can_id, signal, kind, value, low, high in self.events:
+                csv_writer.writerow([timestamp.strftime(CSV_TIMESTAMP_FORMAT), can_id, signal, kind, value,
+                                     '' if low is None else low, '' if high is None else high])
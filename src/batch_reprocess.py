@@ -0,0 +1,125 @@
+"""
+RumiaConfigurator - offline batch reprocessing
+Re-runs the filter and derived-signal pipeline over a directory of recorded CSV
+files with new parameters, spreading the files across a process pool.
+
+Usage:
+    python batch_reprocess.py INPUT_DIR --lowpass 0.5 --highpass 2.0 [--fs 100] [--workers 8]
+"""
+
+import argparse
+import csv
+import datetime
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from signal_graph import DERIVED_SIGNALS, NodeStreamingSignals
+from utils import CSV_HEADER, CSV_TIMESTAMP_FORMAT
+
+
+def read_recording(path):
+    """
+    Read the sample rows of an exported CSV (stops at the blank line before summary rows).
+    Returns: (timestamps as strings, can_ids, x, y, z arrays)
+    """
+    timestamps, can_ids, xs, ys, zs = [], [], [], [], []
+    with open(path, newline='') as csvfile:
+        reader = csv.reader(csvfile)
+        next(reader, None)
+        for row in reader:
+            if not row:
+                break
+            timestamps.append(row[0])
+            can_ids.append(row[1])
+            xs.append(row[2])
+            ys.append(row[3])
+            zs.append(row[4])
+    return timestamps, can_ids, np.array(xs, dtype=float), np.array(ys, dtype=float), np.array(zs, dtype=float)
+
+
+def estimate_sampling_frequency(timestamps, can_ids):
+    """Per-node sampling frequency from the median interval of the most frequent CAN ID."""
+    if len(timestamps) < 2:
+        return 0
+    ids, counts = np.unique(can_ids, return_counts=True)
+    main_id = ids[np.argmax(counts)]
+    times = [datetime.datetime.strptime(ts, CSV_TIMESTAMP_FORMAT).timestamp()
+             for ts, cid in zip(timestamps, can_ids) if cid == main_id]
+    if len(times) < 2:
+        return 0
+    dt = float(np.median(np.diff(times)))
+    return 1.0 / dt if dt > 0 else 0
+
+
+def reprocess_file(path, output_dir, cutoff_lowpass, cutoff_highpass, sampling_frequency=None):
+    """
+    Recompute the derived signals of one recording and write the updated CSV.
+    Each CAN ID is filtered as its own signal, with the same filters as the live path,
+    and rows are written back in their original order. Runs in a worker process.
+    Returns: (path, number of samples, sampling frequency used, error message or None)
+    """
+    try:
+        timestamps, can_ids, x, y, z = read_recording(path)
+        fs = sampling_frequency or estimate_sampling_frequency(timestamps, can_ids)
+        if fs <= 0:
+            return path, len(timestamps), fs, "cannot determine sampling frequency"
+        derived = NodeStreamingSignals(fs, cutoff_lowpass, cutoff_highpass).process(can_ids, x, y, z)
+        columns = [timestamps, can_ids, x.tolist(), y.tolist(), z.tolist()] + [derived[name].tolist() for name in DERIVED_SIGNALS]
+        out_path = os.path.join(output_dir, os.path.basename(path))
+        with open(out_path, 'w', newline='') as csvfile:
+            csv_writer = csv.writer(csvfile)
+            csv_writer.writerow(CSV_HEADER)
+            csv_writer.writerows(zip(*columns))
+        return path, len(timestamps), fs, None
+    except Exception as e:
+        return path, 0, 0, str(e)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Reprocess recorded CSV files with new filter parameters.")
+    parser.add_argument('input_dir', help="directory containing the recorded CSV files")
+    parser.add_argument('--output-dir', help="where to write updated files (default: INPUT_DIR/reprocessed)")
+    parser.add_argument('--pattern', default='*.csv', help="file glob inside input_dir (default: *.csv)")
+    parser.add_argument('--lowpass', type=float, default=1.0, help="low-pass cutoff in Hz (x/y/z_incl)")
+    parser.add_argument('--highpass', type=float, default=1.0, help="high-pass cutoff in Hz (x/y/z_acc)")
+    parser.add_argument('--fs', type=float, default=None, help="sampling frequency in Hz (default: estimated per file)")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: CPU count)")
+    args = parser.parse_args(argv)
+
+    files = sorted(glob.glob(os.path.join(args.input_dir, args.pattern)))
+    if not files:
+        print(f"No files matching {args.pattern} in {args.input_dir}")
+        return 1
+    output_dir = args.output_dir or os.path.join(args.input_dir, 'reprocessed')
+    if os.path.abspath(output_dir) == os.path.abspath(args.input_dir):
+        print("Output directory must differ from the input directory.")
+        return 1
+    os.makedirs(output_dir, exist_ok=True)
+
+    start = time.monotonic()
+    total_samples = 0
+    failures = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [
+            pool.submit(reprocess_file, path, output_dir, args.lowpass, args.highpass, args.fs)
+            for path in files
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            path, samples, fs, error = future.result()
+            if error:
+                failures += 1
+                print(f"[{done}/{len(files)}] {os.path.basename(path)}: ERROR {error}")
+            else:
+                total_samples += samples
+                print(f"[{done}/{len(files)}] {os.path.basename(path)}: {samples} samples @ {fs:.2f} Hz")
+    elapsed = time.monotonic() - start
+    print(f"Done: {len(files) - failures}/{len(files)} files, {total_samples} samples in {elapsed:.1f} s -> {output_dir}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
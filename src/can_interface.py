@@ -1,3 +1,4 @@
+import datetime
 import os
 import subprocess
 import threading
@@ -9,13 +10,17 @@ try:
 except ImportError:
     can = None
 
-from utils import elabora_frame_can
+import slcan_probe
+import socketcan_backend
+from frame_decoders import load_decoder_registry
+from traffic_monitor import TrafficMonitor
 
 
 class CanController:
     """
     Encapsulates CAN bus setup, message sending, and reading.
-    Supports python-can backends (slcan, virtual, kvaser, pcan) and fallback to subprocess (Linux can-utils).
+    Supports python-can backends (slcan, virtual, kvaser, pcan) and fallback to a native
+    Linux SocketCAN raw socket when python-can is not installed.
     """
     
     def __init__(self, log_callback=None):
@@ -25,7 +30,11 @@ class CanController:
         """
         self.log_callback = log_callback or print
         self.can_bus = None
-        self.can_process = None
+        self.native_bus = None
+        self.periodic_tasks = []
+        self.frame_listeners = ()
+        self.decoders = None
+        self.traffic_monitor = None
         self.reader_thread = None
         self.reading_active = False
         self.selected_channel = None
@@ -43,6 +52,17 @@ class CanController:
         except Exception as e:
             self.log_callback(f"Unable to list COM ports: {e}")
         return ports
+
+    def find_slcan_port(self, timeout=0.3):
+        """
+        Probe the serial ports for an SLCAN adapter (cached adapter first, then all ports in parallel).
+        Returns: device name of the adapter, or None if no port answered
+        """
+        result = slcan_probe.discover_slcan_port(timeout, log_callback=self.log_callback)
+        if result is None:
+            return None
+        self.log_callback(f"Adattatore SLCAN trovato: {result.describe()}")
+        return result.device
         
     def setup_bus(self, backend: str | None = None, channel: str | None = None, bitrate: int = 1000000):
         """
@@ -62,37 +82,19 @@ class CanController:
         self.log_callback(f"CAN configuration: backend={can_backend} channel={can_channel} bitrate={bitrate} tty={tty_device}")
 
         if can is None:
-            self.log_callback("python-can not available: using system commands (Linux only).")
+            self.log_callback("python-can not available: using native SocketCAN (Linux only).")
+            if not socketcan_backend.is_available():
+                self.log_callback("Error: AF_CAN sockets are not supported on this platform.")
+                return False
+            if not socketcan_backend.interface_exists(can_interface):
+                if not self._attach_slcan_interface(tty_device, can_interface):
+                    return False
             try:
-                process_slcand = subprocess.run(
-                    ['sudo', 'slcand', '-o', '-c', '-s8', tty_device, can_interface],
-                    capture_output=True, text=True
-                )
-                self.log_callback(process_slcand.stdout.strip() or "slcand executed")
-                if process_slcand.stderr:
-                    self.log_callback(f"slcand STDERR: {process_slcand.stderr.strip()}")
-                process_slcand.check_returncode()
-
-                process_ifconfig = subprocess.run(
-                    ['sudo', 'ifconfig', can_interface, 'up'],
-                    capture_output=True, text=True
-                )
-                self.log_callback(process_ifconfig.stdout.strip() or "ifconfig executed")
-                if process_ifconfig.stderr:
-                    self.log_callback(f"ifconfig STDERR: {process_ifconfig.stderr.strip()}")
-                process_ifconfig.check_returncode()
-
-                self.log_callback("CAN interface configured successfully (subprocess).")
+                self.native_bus = socketcan_backend.SocketCanBus(can_interface)
+                self.log_callback(f"SocketCAN raw socket opened on {can_interface}.")
                 return True
-            except subprocess.CalledProcessError as e:
-                self.log_callback(f"Error configuring CAN interface: {e}")
-                try:
-                    self.log_callback(f"Error details: {e.stderr.strip()}")
-                except Exception:
-                    pass
-                return False
-            except FileNotFoundError:
-                self.log_callback("Error: slcand or ifconfig not found. Ensure can-utils is installed and commands are in PATH.")
+            except OSError as e:
+                self.log_callback(f"Error opening SocketCAN socket on {can_interface}: {e}")
                 return False
 
         try:
@@ -137,13 +139,56 @@ class CanController:
             self.log_callback(f"Error creating python-can bus: {e}")
             return False
 
-    def send_message(self, can_interface, can_id, data_string):
+    def _attach_slcan_interface(self, tty_device, can_interface):
+        """
+        Bind a serial SLCAN adapter to a SocketCAN interface with slcand and bring it up.
+        Only needed once per interface; the native backend then talks to it directly.
+        Returns: True if the interface was configured, False otherwise
+        """
+        try:
+            process_slcand = subprocess.run(
+                ['sudo', 'slcand', '-o', '-c', '-s8', tty_device, can_interface],
+                capture_output=True, text=True
+            )
+            self.log_callback(process_slcand.stdout.strip() or "slcand executed")
+            if process_slcand.stderr:
+                self.log_callback(f"slcand STDERR: {process_slcand.stderr.strip()}")
+            process_slcand.check_returncode()
+
+            process_ifconfig = subprocess.run(
+                ['sudo', 'ifconfig', can_interface, 'up'],
+                capture_output=True, text=True
+            )
+            self.log_callback(process_ifconfig.stdout.strip() or "ifconfig executed")
+            if process_ifconfig.stderr:
+                self.log_callback(f"ifconfig STDERR: {process_ifconfig.stderr.strip()}")
+            process_ifconfig.check_returncode()
+
+            self.log_callback("CAN interface configured successfully (slcand).")
+            return True
+        except subprocess.CalledProcessError as e:
+            self.log_callback(f"Error configuring CAN interface: {e}")
+            try:
+                self.log_callback(f"Error details: {e.stderr.strip()}")
+            except Exception:
+                pass
+            return False
+        except FileNotFoundError:
+            self.log_callback("Error: slcand or ifconfig not found. Ensure can-utils is installed and commands are in PATH.")
+            return False
+
+    def is_bus_ready(self):
+        """Return True if a python-can or native SocketCAN bus is open."""
+        return self.can_bus is not None or self.native_bus is not None
+
+    def send_message(self, can_interface, can_id, data_string, log=True):
         """
         Send a CAN message.
         Args:
-            can_interface: interface name (e.g. 'can0') used for subprocess fallback
+            can_interface: interface name (e.g. 'can0'); kept for compatibility, the open bus is used
             can_id: hex string CAN ID (e.g. '61D')
             data_string: hex bytes string (e.g. '2B00180500010000')
+            log: if False, skip the per-frame success message (errors are always logged)
         Returns: True if sent successfully, False otherwise
         """
         if self.can_bus is not None and can is not None:
@@ -151,47 +196,167 @@ class CanController:
                 data_bytes = bytes.fromhex(data_string)
                 msg = can.Message(arbitration_id=int(can_id, 16), data=data_bytes, is_extended_id=False)
                 self.can_bus.send(msg)
-                self.log_callback(f"CAN message sent (python-can): {can_id}#{data_string}")
+                if log:
+                    self.log_callback(f"CAN message sent (python-can): {can_id}#{data_string}")
                 return True
             except Exception as e:
                 self.log_callback(f"Error sending CAN (python-can): {e}")
                 return False
-        else:
+        elif self.native_bus is not None:
             try:
-                process_cansend = subprocess.run(
-                    ['cansend', can_interface, f'{can_id}#{data_string}'],
-                    capture_output=True, text=True
-                )
-                self.log_callback(process_cansend.stdout.strip() or "cansend executed")
-                if process_cansend.stderr:
-                    self.log_callback(f"cansend STDERR: {process_cansend.stderr.strip()}")
-                process_cansend.check_returncode()
-                self.log_callback(f"CAN message sent: {can_interface} {can_id}#{data_string}")
+                self.native_bus.send(int(can_id, 16), bytes.fromhex(data_string))
+                if log:
+                    self.log_callback(f"CAN message sent (SocketCAN): {self.native_bus.channel} {can_id}#{data_string}")
                 return True
-            except subprocess.CalledProcessError as e:
-                self.log_callback(f"Error sending CAN message: {e}")
-                try:
-                    self.log_callback(f"Error details: {e.stderr.strip()}")
-                except Exception:
-                    pass
-                return False
-            except FileNotFoundError:
-                self.log_callback("Error: cansend not found. Ensure can-utils is installed and cansend is in PATH.")
+            except (OSError, ValueError) as e:
+                self.log_callback(f"Error sending CAN (SocketCAN): {e}")
                 return False
+        else:
+            self.log_callback("CAN bus not initialized: message not sent.")
+            return False
+
+    def send_frames(self, frames, log=False):
+        """
+        Send a batch of frames on the already-open bus.
+        Args:
+            frames: iterable of (arbitration_id, data) with integer IDs and bytes payloads
+            log: if True, log one summary line for the whole batch
+        Returns: number of frames sent (stops at the first error)
+        """
+        sent = 0
+        try:
+            if self.can_bus is not None and can is not None:
+                for arbitration_id, data in frames:
+                    self.can_bus.send(can.Message(arbitration_id=arbitration_id, data=data, is_extended_id=False))
+                    sent += 1
+            elif self.native_bus is not None:
+                sent = self.native_bus.send_many(frames)
+            else:
+                self.log_callback("CAN bus not initialized: frames not sent.")
+                return 0
+        except Exception as e:
+            self.log_callback(f"Error sending CAN batch after {sent} frames: {e}")
+            return sent
+        if log:
+            self.log_callback(f"CAN batch sent: {sent} frames")
+        return sent
 
-    def start_reader(self, data_callback, stop_flag_fn):
+    def send_periodic(self, arbitration_id, data, period, duration=None):
+        """
+        Start cyclic transmission of a frame (python-can bus.send_periodic or native task).
+        Args:
+            arbitration_id: integer CAN ID
+            data: bytes payload (max 8 bytes)
+            period: seconds between frames
+            duration: optional seconds after which transmission stops
+        Returns: task object (with stop()) or None on failure
+        """
+        try:
+            if self.can_bus is not None and can is not None:
+                msg = can.Message(arbitration_id=arbitration_id, data=data, is_extended_id=False)
+                task = self.can_bus.send_periodic(msg, period, duration)
+            elif self.native_bus is not None:
+                task = self.native_bus.send_periodic(arbitration_id, data, period, duration)
+            else:
+                self.log_callback("CAN bus not initialized: periodic send not started.")
+                return None
+        except Exception as e:
+            self.log_callback(f"Error starting periodic send: {e}")
+            return None
+        self.periodic_tasks.append(task)
+        self.log_callback(f"Periodic send started: {arbitration_id:03X}#{data.hex().upper()} every {period * 1000:.1f} ms")
+        return task
+
+    def stop_periodic(self, task=None):
+        """Stop one periodic task, or all of them if task is None."""
+        tasks = [task] if task is not None else list(self.periodic_tasks)
+        for t in tasks:
+            try:
+                t.stop()
+            except Exception as e:
+                self.log_callback(f"Error stopping periodic send: {e}")
+            if t in self.periodic_tasks:
+                self.periodic_tasks.remove(t)
+
+    def add_frame_listener(self, listener):
+        """
+        Register listener(timestamp, arbitration_id, data) called for every raw frame
+        received by the reader thread (before sensor decoding).
+        """
+        self.frame_listeners = self.frame_listeners + (listener,)
+
+    def remove_frame_listener(self, listener):
+        """Unregister a listener added with add_frame_listener."""
+        self.frame_listeners = tuple(l for l in self.frame_listeners if l is not listener)
+
+    def _notify_frame_listeners(self, timestamp, arbitration_id, data):
+        for listener in self.frame_listeners:
+            try:
+                listener(timestamp, arbitration_id, data)
+            except Exception as e:
+                self.log_callback(f"Error in CAN frame listener: {e}")
+
+    def recv_frames(self, timeout=1.0, max_frames=256):
+        """
+        Receive raw frames directly from the bus; only for use while the reader thread is stopped.
+        Returns: list of (timestamp, arbitration_id, data)
+        """
+        if self.can_bus is not None and can is not None:
+            frames = []
+            msg = self.can_bus.recv(timeout=timeout)
+            while msg is not None:
+                frames.append((msg.timestamp, msg.arbitration_id, bytes(msg.data)))
+                if len(frames) >= max_frames:
+                    break
+                msg = self.can_bus.recv(timeout=0)
+            return frames
+        if self.native_bus is not None:
+            return [frame[:3] for frame in self.native_bus.recv_batch(timeout=timeout, max_frames=max_frames)]
+        return []
+
+    def _dispatch_frame(self, arbitration_id, data, timestamp, data_callback, signal_callback, is_extended_id=False):
+        self.traffic_monitor.record(arbitration_id, len(data), is_extended_id)
+        decoder = self.decoders.lookup(arbitration_id)
+        if decoder is None:
+            self.traffic_monitor.ignored_frames += 1
+            return
+        values = decoder.decode(data)
+        if values is None:
+            self.traffic_monitor.unparsed_frames += 1
+            return
+        ts = datetime.datetime.now() if timestamp is None else datetime.datetime.fromtimestamp(timestamp)
+        can_id = f"{arbitration_id:X}"
+        if decoder.xyz_order is not None:
+            ix, iy, iz = decoder.xyz_order
+            data_callback(ts, can_id, values[ix], values[iy], values[iz])
+        elif signal_callback is not None:
+            signal_callback(ts, can_id, decoder.name, dict(zip(decoder.signal_names, values)))
+
+    def load_decoders(self):
+        """(Re)load the frame decoder config; called before each acquisition so edits take effect."""
+        self.decoders = load_decoder_registry(log_callback=self.log_callback)
+        return self.decoders
+
+    def start_reader(self, data_callback, stop_flag_fn, signal_callback=None):
         """
         Start a background thread to read CAN messages.
         Args:
-            data_callback: function(timestamp, can_id, x, y, z) called when data is parsed
+            data_callback: function(timestamp, can_id, x, y, z) called for frames decoded into x, y, z
             stop_flag_fn: function() returning True when reading should stop
+            signal_callback: optional function(timestamp, can_id, decoder_name, values_dict) called
+                for frames of other node types (e.g. temperature)
         """
+        if self.decoders is None:
+            self.load_decoders()
+        self.traffic_monitor = TrafficMonitor(self.selected_bitrate or 1000000)
         self.reading_active = True
-        self.reader_thread = threading.Thread(target=self._read_loop, args=(data_callback, stop_flag_fn))
+        self.reader_thread = threading.Thread(
+            target=self._read_loop, args=(data_callback, stop_flag_fn, signal_callback)
+        )
         self.reader_thread.daemon = True
         self.reader_thread.start()
 
-    def _read_loop(self, data_callback, stop_flag_fn):
+    def _read_loop(self, data_callback, stop_flag_fn, signal_callback=None):
         """
         Internal loop for reading CAN data. Runs in a background thread.
         """
@@ -206,37 +371,40 @@ class CanController:
                         break
                     if msg is None:
                         continue
+                    if msg.is_error_frame:
+                        self.traffic_monitor.error_frames += 1
+                        continue
+                    if self.frame_listeners:
+                        self._notify_frame_listeners(msg.timestamp, msg.arbitration_id, msg.data)
                     try:
-                        hex_bytes = ' '.join(f"{b:02X}" for b in msg.data)
-                        line = f"can0 {msg.arbitration_id:X} [{len(msg.data)}] {hex_bytes}"
-                        timestamp, can_id, x, y, z = elabora_frame_can(line)
-                        if timestamp:
-                            data_callback(timestamp, can_id, x, y, z)
+                        self._dispatch_frame(
+                            msg.arbitration_id, msg.data, None, data_callback, signal_callback, msg.is_extended_id
+                        )
                     except Exception as e:
+                        self.traffic_monitor.unparsed_frames += 1
                         self.log_callback(f"Error parsing python-can message: {e}")
                 self.log_callback("python-can CAN thread terminated.")
+            elif self.native_bus is not None:
+                self.log_callback("Reading CAN via native SocketCAN.")
+                errors_before = self.native_bus.error_frames
+                while not stop_flag_fn():
+                    try:
+                        frames = self.native_bus.recv_batch(timeout=1.0)
+                    except OSError as e:
+                        self.log_callback(f"SocketCAN recv error: {e}")
+                        break
+                    self.traffic_monitor.error_frames = self.native_bus.error_frames - errors_before
+                    for ts, arbitration_id, data, is_extended_id in frames:
+                        if self.frame_listeners:
+                            self._notify_frame_listeners(ts, arbitration_id, data)
+                        try:
+                            self._dispatch_frame(arbitration_id, data, ts, data_callback, signal_callback, is_extended_id)
+                        except Exception as e:
+                            self.traffic_monitor.unparsed_frames += 1
+                            self.log_callback(f"Error parsing SocketCAN frame: {e}")
+                self.log_callback("SocketCAN CAN thread terminated.")
             else:
-                self.log_callback("Reading CAN via candump (subprocess).")
-                try:
-                    self.can_process = subprocess.Popen(
-                        ['candump', 'can0'],
-                        stdout=subprocess.PIPE, text=True, bufsize=1
-                    )
-                    for line in iter(self.can_process.stdout.readline, ''):
-                        if stop_flag_fn():
-                            break
-                        line = line.strip()
-                        if line:
-                            timestamp, can_id, x, y, z = elabora_frame_can(line)
-                            if timestamp:
-                                data_callback(timestamp, can_id, x, y, z)
-                    if self.can_process and self.can_process.stdout:
-                        self.can_process.stdout.close()
-                        self.can_process.wait()
-                except FileNotFoundError:
-                    self.log_callback("Error: candump not found.")
-                except Exception as e:
-                    self.log_callback(f"Error in candump thread: {e}")
+                self.log_callback("CAN bus not initialized: nothing to read.")
         except Exception as e:
             self.log_callback(f"Error in CAN thread: {e}")
         finally:
@@ -244,20 +412,14 @@ class CanController:
             self.log_callback("CAN reader thread terminated.")
 
     def stop_reader(self):
-        """Stop the background reader and cleanup subprocess if present."""
+        """Stop the background reader thread."""
         self.reading_active = False
-        if self.can_process and self.can_process.poll() is None:
-            try:
-                self.can_process.terminate()
-                self.can_process.wait()
-                self.log_callback("candump process terminated.")
-            except Exception as e:
-                self.log_callback(f"Error terminating candump process: {e}")
         if self.reader_thread and self.reader_thread.is_alive():
             self.reader_thread.join(timeout=2.0)
 
     def shutdown(self):
         """Cleanup and close CAN bus."""
+        self.stop_periodic()
         self.stop_reader()
         if self.can_bus:
             try:
@@ -265,3 +427,10 @@ class CanController:
                 self.log_callback("CAN bus closed.")
             except Exception as e:
                 self.log_callback(f"Error closing CAN bus: {e}")
+        if self.native_bus:
+            try:
+                self.native_bus.shutdown()
+                self.native_bus = None
+                self.log_callback("SocketCAN socket closed.")
+            except Exception as e:
+                self.log_callback(f"Error closing SocketCAN socket: {e}")
@@ -0,0 +1,277 @@
+import datetime
+import json
+import lzma
+import os
+import struct
+import zlib
+
+import numpy as np
+
+INDEX_FILENAME = 'index.jsonl'
+METADATA_FILENAME = 'meta.json'
+CODECS = {
+    'zlib': (lambda data, level: zlib.compress(data, level), zlib.decompress),
+    'lzma': (lambda data, level: lzma.compress(data, preset=level), lzma.decompress),
+}
+
+# Default counts per unit: the inclinometer's int16 counts (value in g * 1000).
+# Each index entry records the scale its samples were stored with.
+SCALE = 1000
+_BLOB_HEADER = struct.Struct('<I')
+
+
+def _encode_block(times_us, x, y, z):
+    """Delta-encode one CAN ID's samples: int64 timestamps (us) and int16 axes."""
+    count = len(times_us)
+    parts = [_BLOB_HEADER.pack(count), np.diff(times_us, prepend=np.int64(0)).astype('<i8').tobytes()]
+    for axis in (x, y, z):
+        # int16 differences wrap around and are undone exactly by a wrapping cumsum
+        parts.append(np.diff(axis, prepend=np.int16(0)).astype('<i2').tobytes())
+    return b''.join(parts)
+
+
+def _decode_block(blob):
+    (count,) = _BLOB_HEADER.unpack_from(blob)
+    offset = _BLOB_HEADER.size
+    times_us = np.cumsum(np.frombuffer(blob, dtype='<i8', count=count, offset=offset), dtype=np.int64)
+    offset += 8 * count
+    axes = []
+    for _ in range(3):
+        deltas = np.frombuffer(blob, dtype='<i2', count=count, offset=offset)
+        axes.append(np.cumsum(deltas, dtype=np.int16))
+        offset += 2 * count
+    return times_us, axes[0], axes[1], axes[2]
+
+
+class ChunkStoreWriter:
+    """
+    Append-only recording in fixed-duration chunks.
+    Each chunk file holds one compressed, delta-encoded block per CAN ID; index.jsonl
+    records the chunk time range and the byte range of every CAN ID block, so a reader
+    can load a time range of one node without touching anything else.
+    Several acquisitions can share a directory: every index entry carries the session id
+    of the writer that produced it and that session's metadata.
+    """
+
+    def __init__(self, directory, chunk_seconds=60, codec='zlib', level=6, metadata=None, scale=SCALE):
+        """
+        Args:
+            directory: recording directory (created if missing)
+            chunk_seconds: duration covered by each chunk file
+            codec: 'zlib' or 'lzma'
+            level: compression level passed to the codec
+            metadata: optional JSON-serializable dict (e.g. sampling_frequency) saved in every
+                index entry of this session
+            scale: counts per unit; values are stored as round(value * scale) in int16, so the
+                scale should match the decoder resolution (see DecoderRegistry.xyz_int16_scale)
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec '{codec}'.")
+        self.directory = directory
+        self.chunk_us = int(chunk_seconds * 1e6)
+        self.codec = codec
+        self.level = level
+        self.scale = scale
+        self.metadata = dict(metadata or {})
+        self.session = datetime.datetime.now().strftime('%Y%m%dT%H%M%S.%f')
+        os.makedirs(directory, exist_ok=True)
+        self._chunk_id = self._next_chunk_id()
+        self._chunk_start = None
+        self._buffer = {}
+        self.samples_written = 0
+        # Samples outside the int16 range at this scale, saturated on write
+        self.clipped_samples = 0
+
+    def _next_chunk_id(self):
+        index_path = os.path.join(self.directory, INDEX_FILENAME)
+        if not os.path.exists(index_path):
+            return 0
+        with open(index_path) as f:
+            return sum(1 for line in f if line.strip())
+
+    def append(self, points):
+        """
+        Add samples.
+        Args:
+            points: iterable of (timestamp, can_id, x, y, z) with datetime timestamps and values in g
+        """
+        for ts, can_id, x, y, z in points:
+            t_us = int(round(ts.timestamp() * 1e6))
+            chunk_start = t_us - t_us % self.chunk_us
+            if self._chunk_start is None:
+                self._chunk_start = chunk_start
+            elif chunk_start != self._chunk_start:
+                self.flush()
+                self._chunk_start = chunk_start
+            block = self._buffer.get(can_id)
+            if block is None:
+                block = self._buffer[can_id] = ([], [], [], [])
+            block[0].append(t_us)
+            block[1].append(round(x * self.scale))
+            block[2].append(round(y * self.scale))
+            block[3].append(round(z * self.scale))
+
+    def flush(self):
+        """Write the current chunk (if any) and its index entry."""
+        if not self._buffer:
+            return
+        compress = CODECS[self.codec][0]
+        filename = f"chunk_{self._chunk_id:06d}.bin"
+        entry = {
+            'file': filename, 'session': self.session, 'metadata': self.metadata, 'codec': self.codec,
+            'scale': self.scale, 't_start': None, 't_end': None, 'ids': {},
+        }
+        offset = 0
+        with open(os.path.join(self.directory, filename), 'wb') as f:
+            for can_id, (times, xs, ys, zs) in self._buffer.items():
+                times_us = np.array(times, dtype=np.int64)
+                order = np.argsort(times_us, kind='stable')
+                times_us = times_us[order]
+                counts = np.array([xs, ys, zs], dtype=np.int64)
+                self.clipped_samples += int(np.count_nonzero(np.any((counts < -32768) | (counts > 32767), axis=0)))
+                axes = [np.clip(v, -32768, 32767).astype(np.int16)[order] for v in counts]
+                blob = compress(_encode_block(times_us, *axes), self.level)
+                f.write(blob)
+                t0, t1 = int(times_us[0]), int(times_us[-1])
+                entry['ids'][can_id] = {'offset': offset, 'length': len(blob), 'count': len(times), 't_start': t0, 't_end': t1}
+                entry['t_start'] = t0 if entry['t_start'] is None else min(entry['t_start'], t0)
+                entry['t_end'] = t1 if entry['t_end'] is None else max(entry['t_end'], t1)
+                offset += len(blob)
+                self.samples_written += len(times)
+        with open(os.path.join(self.directory, INDEX_FILENAME), 'a') as f:
+            f.write(json.dumps(entry) + '\n')
+        self._chunk_id += 1
+        self._buffer = {}
+
+    def close(self):
+        self.flush()
+
+
+class ChunkStoreReader:
+    """Time/CAN-ID indexed access to a recording written by ChunkStoreWriter."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.reload()
+
+    def reload(self):
+        """Re-read the index (e.g. while the recording is still being written)."""
+        self.index = []
+        # Recording-wide metadata of recordings written before it was stored per session
+        self.metadata = {}
+        meta_path = os.path.join(self.directory, METADATA_FILENAME)
+        if os.path.exists(meta_path):
+            with open(meta_path) as f:
+                self.metadata = json.load(f)
+        index_path = os.path.join(self.directory, INDEX_FILENAME)
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                self.index = [json.loads(line) for line in f if line.strip()]
+
+    def time_range(self):
+        """Return (first, last) sample datetimes, or None if the recording is empty."""
+        if not self.index:
+            return None
+        t0 = min(e['t_start'] for e in self.index)
+        t1 = max(e['t_end'] for e in self.index)
+        return datetime.datetime.fromtimestamp(t0 / 1e6), datetime.datetime.fromtimestamp(t1 / 1e6)
+
+    def can_ids(self, session=None):
+        return sorted({can_id for e in self.index if session is None or e.get('session') == session for can_id in e['ids']})
+
+    def sessions(self):
+        """Return the session ids of the recording, oldest first."""
+        sessions = []
+        for entry in sorted(self.index, key=lambda e: e['t_start']):
+            if entry.get('session') is not None and entry['session'] not in sessions:
+                sessions.append(entry['session'])
+        return sessions
+
+    def entry_metadata(self, entry):
+        """Metadata of the session that wrote an index entry."""
+        return {**self.metadata, **entry.get('metadata', {})}
+
+    def metadata_for(self, t_start=None, t_end=None, can_id=None, session=None):
+        """Metadata of the first block selected by the arguments (see iter_chunks)."""
+        t_start_us = None if t_start is None else int(t_start.timestamp() * 1e6)
+        t_end_us = None if t_end is None else int(t_end.timestamp() * 1e6)
+        for entry, _, _ in self._selected_blocks(t_start_us, t_end_us, can_id, session):
+            return self.entry_metadata(entry)
+        return dict(self.metadata)
+
+    def _selected_blocks(self, t_start_us, t_end_us, can_id, session=None):
+        """Yield (entry, can_id, block_info) for blocks overlapping the range, in time order."""
+        for entry in sorted(self.index, key=lambda e: e['t_start']):
+            if session is not None and entry.get('session') != session:
+                continue
+            if t_end_us is not None and entry['t_start'] > t_end_us:
+                continue
+            if t_start_us is not None and entry['t_end'] < t_start_us:
+                continue
+            for cid, info in entry['ids'].items():
+                if can_id is not None and cid != can_id:
+                    continue
+                if t_end_us is not None and info['t_start'] > t_end_us:
+                    continue
+                if t_start_us is not None and info['t_end'] < t_start_us:
+                    continue
+                yield entry, cid, info
+
+    def iter_chunks(self, t_start=None, t_end=None, can_id=None, session=None):
+        """
+        Yield decoded data one chunk at a time, reading only the needed byte ranges.
+        Args:
+            t_start, t_end: optional datetime bounds (inclusive)
+            can_id: optional CAN ID string (e.g. '19D')
+            session: optional session id (ChunkStoreWriter.session) to read one acquisition
+        Yields: dict with 'time_us' (int64), 'can_id' (str array), 'x', 'y', 'z' (float, in g)
+        """
+        t_start_us = None if t_start is None else int(t_start.timestamp() * 1e6)
+        t_end_us = None if t_end is None else int(t_end.timestamp() * 1e6)
+        current_file = None
+        parts = []
+        for entry, cid, info in self._selected_blocks(t_start_us, t_end_us, can_id, session):
+            if current_file is not None and entry['file'] != current_file and parts:
+                yield self._merge(parts)
+                parts = []
+            current_file = entry['file']
+            with open(os.path.join(self.directory, entry['file']), 'rb') as f:
+                f.seek(info['offset'])
+                blob = CODECS[entry['codec']][1](f.read(info['length']))
+            times_us, x, y, z = _decode_block(blob)
+            scale = entry.get('scale', SCALE)
+            mask = np.ones(len(times_us), dtype=bool)
+            if t_start_us is not None:
+                mask &= times_us >= t_start_us
+            if t_end_us is not None:
+                mask &= times_us <= t_end_us
+            parts.append((times_us[mask], cid, x[mask] / scale, y[mask] / scale, z[mask] / scale))
+        if parts:
+            yield self._merge(parts)
+
+    @staticmethod
+    def _merge(parts):
+        """Merge the per-ID blocks of one chunk into a single time-ordered block."""
+        times_us = np.concatenate([p[0] for p in parts])
+        order = np.argsort(times_us, kind='stable')
+        ids = np.concatenate([np.full(len(p[0]), p[1]) for p in parts])
+        return {
+            'time_us': times_us[order],
+            'can_id': ids[order],
+            'x': np.concatenate([p[2] for p in parts])[order],
+            'y': np.concatenate([p[3] for p in parts])[order],
+            'z': np.concatenate([p[4] for p in parts])[order],
+        }
+
+    def iter_points(self, t_start=None, t_end=None, can_id=None, session=None):
+        """Yield lists of (timestamp, can_id, x, y, z) tuples, one list per chunk."""
+        for block in self.iter_chunks(t_start, t_end, can_id, session):
+            times = [datetime.datetime.fromtimestamp(t / 1e6) for t in block['time_us'].tolist()]
+            yield list(zip(times, block['can_id'].tolist(), block['x'].tolist(), block['y'].tolist(), block['z'].tolist()))
+
+    def load_points(self, t_start=None, t_end=None, can_id=None, session=None):
+        """Load a range as a data_points list (same format as the live acquisition)."""
+        points = []
+        for chunk in self.iter_points(t_start, t_end, can_id, session):
+            points.extend(chunk)
+        return points
@@ -0,0 +1,90 @@
+import datetime
+
+import numpy as np
+from signal_graph import DERIVED_SIGNALS, NodeStreamingSignals, ZeroPhaseSignals
+from utils import CSV_TIMESTAMP_FORMAT
+
+
+def memory_blocks(data_points, by_node=False, block_size=65536):
+    """
+    Yield (can_ids, time_us, x, y, z) array blocks of in-memory samples.
+    Args:
+        data_points: list of (timestamp, can_id, x, y, z)
+        by_node: one node at a time (blocks contiguous per CAN ID) instead of acquisition order
+        block_size: samples per block
+    """
+    if by_node:
+        by_id = {}
+        for point in data_points:
+            by_id.setdefault(point[1], []).append(point)
+        groups = [by_id[can_id] for can_id in sorted(by_id)]
+    else:
+        groups = [data_points]
+    for points in groups:
+        for start in range(0, len(points), block_size):
+            block = points[start:start + block_size]
+            yield (
+                np.array([p[1] for p in block]),
+                np.array([int(round(p[0].timestamp() * 1e6)) for p in block], dtype=np.int64),
+                np.array([p[2] for p in block], dtype=float),
+                np.array([p[3] for p in block], dtype=float),
+                np.array([p[4] for p in block], dtype=float),
+            )
+
+
+def recording_blocks(reader, session=None, by_node=False):
+    """
+    Yield (can_ids, time_us, x, y, z) array blocks of a chunk-store recording, one chunk at a time.
+    Args:
+        reader: ChunkStoreReader
+        session: optional session id to export a single acquisition
+        by_node: one node at a time (blocks contiguous per CAN ID) instead of time order
+    """
+    for can_id in (reader.can_ids(session) if by_node else [None]):
+        for block in reader.iter_chunks(can_id=can_id, session=session):
+            yield block['can_id'], block['time_us'], block['x'], block['y'], block['z']
+
+
+def export_rows(blocks, fs, cutoff_lowpass, cutoff_highpass, zero_phase=False):
+    """
+    Yield CSV data rows (see utils.CSV_HEADER) with the derived signals filtered per node.
+    The causal filters are those of the live path (NodeStreamingSignals), so the export of
+    an acquisition does not depend on whether it was kept in memory or recorded to disk,
+    and rows keep the order of the blocks. Zero-phase filtering delays each node's output
+    until its following samples are known, so it needs blocks contiguous per CAN ID and
+    writes rows grouped by node.
+    Args:
+        blocks: iterable of (can_ids, time_us, x, y, z) arrays (see memory_blocks, recording_blocks)
+        fs: per-node sampling frequency in Hz
+        cutoff_lowpass, cutoff_highpass: filter cutoffs in Hz
+        zero_phase: forward-backward filtering (ZeroPhaseSignals)
+    """
+    def rows(can_ids, out):
+        columns = [out['x'].tolist(), out['y'].tolist(), out['z'].tolist()] + [out[name].tolist() for name in DERIVED_SIGNALS]
+        for t_us, can_id, values in zip(out['time_us'].tolist(), can_ids, zip(*columns)):
+            timestamp = datetime.datetime.fromtimestamp(t_us / 1e6).strftime(CSV_TIMESTAMP_FORMAT)
+            yield [timestamp, can_id, *values]
+
+    if not zero_phase:
+        signals = NodeStreamingSignals(fs, cutoff_lowpass, cutoff_highpass)
+        for can_ids, time_us, x, y, z in blocks:
+            out = dict(signals.process(can_ids, x, y, z), time_us=time_us)
+            yield from rows(np.asarray(can_ids).tolist(), out)
+        return
+
+    current_id, signals = None, None
+    for can_ids, time_us, x, y, z in blocks:
+        if len(time_us) == 0:
+            continue
+        can_id = np.asarray(can_ids)[0].item()
+        if can_id != current_id:
+            if signals is not None:
+                out = signals.finish()
+                yield from rows([current_id] * len(out['time_us']), out)
+            current_id = can_id
+            signals = ZeroPhaseSignals(fs, cutoff_lowpass, cutoff_highpass)
+        out = signals.process(x, y, z, extra={'time_us': time_us})
+        yield from rows([can_id] * len(out['time_us']), out)
+    if signals is not None:
+        out = signals.finish()
+        yield from rows([current_id] * len(out['time_us']), out)
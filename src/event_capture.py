@@ -0,0 +1,200 @@
+import csv
+import os
+from collections import deque
+
+import numpy as np
+from signal_graph import DERIVED_SIGNALS
+from utils import CSV_HEADER, CSV_TIMESTAMP_FORMAT
+
+TRIGGER_MODES = ('threshold', 'slope', 'window')
+TRIGGER_DIRECTIONS = ('above', 'below')
+
+
+class TriggerCondition:
+    """
+    Edge-triggered condition on one raw or derived signal.
+    Modes:
+        threshold: value above/below level
+        slope: rate of change (units per second) above/below level
+        window: value outside [low, high]
+    The trigger fires on the sample where the condition becomes true. Chunks may interleave
+    several nodes: edge and slope state are kept per CAN ID, so samples of one node are
+    never compared with another's.
+    """
+
+    def __init__(self, signal, mode='threshold', level=0.0, direction='above', low=None, high=None):
+        if mode not in TRIGGER_MODES:
+            raise ValueError(f"Unknown trigger mode '{mode}'.")
+        if direction not in TRIGGER_DIRECTIONS:
+            raise ValueError(f"Unknown trigger direction '{direction}'.")
+        if mode == 'window' and (low is None or high is None or low >= high):
+            raise ValueError("Window trigger needs low < high.")
+        self.signal = signal
+        self.mode = mode
+        self.level = level
+        self.direction = direction
+        self.low = low
+        self.high = high
+        self.reset()
+
+    def reset(self):
+        # Per CAN ID: last value (for the slope) and whether the condition was true on it
+        self._last_value = {}
+        self._was_active = {}
+
+    def describe(self):
+        if self.mode == 'window':
+            return f"{self.signal} outside [{self.low}, {self.high}]"
+        quantity = self.signal if self.mode == 'threshold' else f"d({self.signal})/dt"
+        op = '>' if self.direction == 'above' else '<'
+        return f"{quantity} {op} {self.level}"
+
+    def fire_mask(self, values, fs, can_ids=None):
+        """
+        Evaluate one chunk.
+        Args:
+            values: signal samples
+            fs: per-node sampling frequency in Hz
+            can_ids: CAN ID of each sample (None: all samples belong to one node)
+        Returns: boolean array, True where the trigger fires
+        """
+        values = np.asarray(values, dtype=float)
+        n = values.size
+        if n == 0:
+            return np.zeros(0, dtype=bool)
+        if can_ids is None:
+            node_ids, inverse = [None], np.zeros(n, dtype=np.intp)
+        else:
+            unique_ids, inverse = np.unique(np.asarray(can_ids), return_inverse=True)
+            node_ids = unique_ids.tolist()
+        # Group samples by node with one stable sort, keeping each node's time order
+        order = np.argsort(inverse, kind='stable')
+        g = inverse[order]
+        v = values[order]
+        starts = np.empty(n, dtype=bool)
+        starts[0] = True
+        starts[1:] = g[1:] != g[:-1]
+        ends = np.empty(n, dtype=bool)
+        ends[:-1] = starts[1:]
+        ends[-1] = True
+
+        if self.mode == 'window':
+            active = (v < self.low) | (v > self.high)
+        else:
+            if self.mode == 'slope':
+                prev = np.empty(n)
+                prev[1:] = v[:-1]
+                last = np.array([self._last_value.get(node, np.nan) for node in node_ids])
+                prev[starts] = last[g[starts]]
+                # A node's first sample has no predecessor: zero slope
+                prev = np.where(np.isnan(prev), v, prev)
+                quantity = (v - prev) * fs
+            else:
+                quantity = v
+            active = quantity > self.level if self.direction == 'above' else quantity < self.level
+
+        previous = np.empty(n, dtype=bool)
+        previous[1:] = active[:-1]
+        # No trigger on a node's very first sample if the condition is already true
+        was_active = np.array([self._was_active.get(node, True) for node in node_ids])
+        previous[starts] = was_active[g[starts]]
+        for k, value, state in zip(g[ends].tolist(), v[ends].tolist(), active[ends].tolist()):
+            self._last_value[node_ids[k]] = value
+            self._was_active[node_ids[k]] = state
+        fire = np.empty(n, dtype=bool)
+        fire[order] = active & ~previous
+        return fire
+
+
+class EventCapture:
+    """
+    Keeps a bounded pre-trigger ring buffer of rows and, when a trigger fires, saves
+    pre + post trigger samples to one CSV file per event. Memory is bounded by the
+    window size and disk usage grows with the number of events, not run length.
+    """
+
+    def __init__(self, conditions, fs, pre_seconds=2.0, post_seconds=3.0, output_dir='.', log_callback=None):
+        """
+        Args:
+            conditions: list of TriggerCondition (any of them starts an event)
+            fs: sampling frequency in Hz
+            pre_seconds: seconds kept before the trigger sample
+            post_seconds: seconds captured from the trigger sample on
+            output_dir: directory where event CSV files are written
+            log_callback: optional function(message)
+        """
+        self.conditions = list(conditions)
+        self.fs = fs
+        self.pre_samples = max(0, int(round(pre_seconds * fs)))
+        self.post_samples = max(1, int(round(post_seconds * fs)))
+        self.output_dir = output_dir
+        self.log_callback = log_callback or print
+        self.event_count = 0
+        self._pre = deque(maxlen=self.pre_samples)
+        self._event = None
+        self._post_remaining = 0
+        self._trigger_info = None
+
+    def process(self, points, chunk):
+        """
+        Feed one ingest chunk.
+        Args:
+            points: list of (timestamp, can_id, x, y, z)
+            chunk: dict of streaming signals for the same samples
+        """
+        n = len(points)
+        if n == 0:
+            return
+        can_ids = [p[1] for p in points]
+        masks = [cond.fire_mask(chunk[cond.signal], self.fs, can_ids) for cond in self.conditions]
+        fire = np.logical_or.reduce(masks) if masks else np.zeros(n, dtype=bool)
+        derived = [chunk[name] for name in DERIVED_SIGNALS]
+        rows = [p + tuple(col[i] for col in derived) for i, p in enumerate(points)]
+
+        i = 0
+        while i < n:
+            if self._event is not None:
+                take = min(self._post_remaining, n - i)
+                self._event.extend(rows[i:i + take])
+                self._pre.extend(rows[i:i + take])
+                self._post_remaining -= take
+                i += take
+                if self._post_remaining == 0:
+                    self._write_event()
+                continue
+            hits = np.flatnonzero(fire[i:])
+            if hits.size == 0:
+                self._pre.extend(rows[i:])
+                break
+            j = i + int(hits[0])
+            self._pre.extend(rows[i:j])
+            cond = next(c for c, mask in zip(self.conditions, masks) if mask[j])
+            self._event = list(self._pre)
+            self._trigger_info = (rows[j][0], f"{cond.describe()} @ {rows[j][1]}")
+            self._post_remaining = self.post_samples
+            i = j
+
+    def flush(self):
+        """Write an event still being captured (e.g. when acquisition stops)."""
+        if self._event is not None:
+            self._write_event()
+
+    def _write_event(self):
+        rows = self._event
+        trigger_time, description = self._trigger_info
+        self._event = None
+        self._post_remaining = 0
+        self.event_count += 1
+        filename = os.path.join(
+            self.output_dir, f"event_{self.event_count:04d}_{trigger_time.strftime('%Y%m%d_%H%M%S_%f')}.csv"
+        )
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(filename, 'w', newline='') as csvfile:
+                csv_writer = csv.writer(csvfile)
+                csv_writer.writerow(CSV_HEADER)
+                for row in rows:
+                    csv_writer.writerow([row[0].strftime(CSV_TIMESTAMP_FORMAT)] + list(row[1:]))
+            self.log_callback(f"Evento {self.event_count} ({description}): {len(rows)} campioni salvati in {filename}")
+        except OSError as e:
+            self.log_callback(f"Error saving event {self.event_count}: {e}")
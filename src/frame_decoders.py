@@ -0,0 +1,174 @@
+import json
+import os
+import struct
+
+from utils import resource_path
+
+# Signal types and their struct format characters
+SIGNAL_TYPES = {
+    'int8': 'b', 'uint8': 'B',
+    'int16': 'h', 'uint16': 'H',
+    'int32': 'i', 'uint32': 'I',
+    'float32': 'f',
+}
+ENDIANNESS = {'little': '<', 'big': '>'}
+# Signals a decoder must produce to feed the acquisition pipeline (plots, filters, CSV)
+XYZ_SIGNALS = ('x', 'y', 'z')
+DEFAULT_CONFIG_PATH = 'assets/decoders.json'
+
+# Built-in layout of the Rumia inclinometer frame, used when no config file is found
+DEFAULT_CONFIG = {
+    'ignore': ['29D', '71D'],
+    'default': {
+        'name': 'accelerometer',
+        'signals': [
+            {'name': axis, 'offset': 2 * i, 'type': 'int16', 'endian': 'little', 'scale': 0.001}
+            for i, axis in enumerate(XYZ_SIGNALS)
+        ],
+    },
+    'ids': {},
+}
+
+
+class FrameDecoder:
+    """
+    Decoder for one frame layout, compiled from its spec into struct.Struct objects.
+    Gaps between signals become pad bytes, so decoding is one unpack_from plus scaling.
+    Signals may use different byte orders: each byte order then gets its own Struct
+    (padded to the absolute offsets) and the values are put back in offset order.
+    """
+
+    def __init__(self, name, signals):
+        """
+        Args:
+            name: node type name (e.g. 'accelerometer', 'temperature')
+            signals: list of dicts with name, offset, type, optional endian ('little') and scale (1.0)
+        """
+        if not signals:
+            raise ValueError(f"Decoder '{name}' has no signals.")
+        ordered = sorted(signals, key=lambda s: s['offset'])
+        position = 0
+        for spec in ordered:
+            if spec['type'] not in SIGNAL_TYPES:
+                raise ValueError(f"Decoder '{name}': unknown type '{spec['type']}'.")
+            if spec.get('endian', 'little') not in ENDIANNESS:
+                raise ValueError(f"Decoder '{name}': signal '{spec['name']}' endian must be 'little' or 'big'.")
+            if spec['offset'] < position:
+                raise ValueError(f"Decoder '{name}': signal '{spec['name']}' overlaps the previous one.")
+            position = spec['offset'] + struct.calcsize('<' + SIGNAL_TYPES[spec['type']])
+        if position > 8:
+            raise ValueError(f"Decoder '{name}': layout exceeds 8 data bytes.")
+
+        # Byte order only matters for multi-byte signals; single bytes join the first group
+        multi_byte = [s.get('endian', 'little') for s in ordered if s['type'] not in ('int8', 'uint8')]
+        groups = {}
+        for i, spec in enumerate(ordered):
+            endian = spec.get('endian', 'little') if spec['type'] not in ('int8', 'uint8') \
+                else (multi_byte[0] if multi_byte else 'little')
+            groups.setdefault(endian, []).append(i)
+        self._structs = []
+        unpack_order = []
+        for endian, indices in groups.items():
+            fmt, position = ENDIANNESS[endian], 0
+            for i in indices:
+                spec = ordered[i]
+                fmt += 'x' * (spec['offset'] - position) + SIGNAL_TYPES[spec['type']]
+                position = spec['offset'] + struct.calcsize('<' + SIGNAL_TYPES[spec['type']])
+            self._structs.append(struct.Struct(fmt))
+            unpack_order.extend(indices)
+        # Position in the concatenated unpack results of each signal, in offset order
+        self._gather = None if len(self._structs) == 1 else tuple(unpack_order.index(i) for i in range(len(ordered)))
+        self._struct = self._structs[0]
+
+        self.name = name
+        self.signal_names = tuple(spec['name'] for spec in ordered)
+        self.signal_types = tuple(spec['type'] for spec in ordered)
+        self.scales = tuple(float(spec.get('scale', 1.0)) for spec in ordered)
+        self.min_length = max(s.size for s in self._structs)
+        # Signals in x, y, z order when this decoder feeds the acquisition pipeline
+        self.xyz_order = (
+            tuple(self.signal_names.index(axis) for axis in XYZ_SIGNALS)
+            if set(XYZ_SIGNALS) <= set(self.signal_names) else None
+        )
+
+    def decode(self, data):
+        """Return the scaled signal values in signal_names order, or None if the frame is too short."""
+        if len(data) < self.min_length:
+            return None
+        if self._gather is None:
+            return tuple(v * s for v, s in zip(self._struct.unpack_from(data), self.scales))
+        raw = tuple(value for st in self._structs for value in st.unpack_from(data))
+        return tuple(raw[i] * s for i, s in zip(self._gather, self.scales))
+
+
+class DecoderRegistry:
+    """
+    Maps arbitration IDs to compiled FrameDecoders.
+    lookup() is a single dict access; ignored IDs map to None and unlisted IDs fall back
+    to the default decoder, so the cost per frame does not depend on the number of node types.
+    """
+
+    def __init__(self, decoders=None, default=None, ignored=()):
+        """
+        Args:
+            decoders: dict arbitration ID (int) -> FrameDecoder
+            default: FrameDecoder for IDs not listed (None to drop them)
+            ignored: arbitration IDs (int) that are never decoded
+        """
+        self.default = default
+        self._table = dict(decoders or {})
+        for arbitration_id in ignored:
+            self._table[arbitration_id] = None
+
+    @classmethod
+    def from_config(cls, config):
+        """Build a registry from a config dict (see assets/decoders.json)."""
+        def compile_spec(spec):
+            return FrameDecoder(spec.get('name', 'node'), spec['signals'])
+
+        decoders = {int(can_id, 16): compile_spec(spec) for can_id, spec in config.get('ids', {}).items()}
+        default = compile_spec(config['default']) if config.get('default') else None
+        ignored = [int(can_id, 16) for can_id in config.get('ignore', [])]
+        return cls(decoders, default, ignored)
+
+    def lookup(self, arbitration_id):
+        """Return the FrameDecoder for an arbitration ID, or None if the ID is not decoded."""
+        return self._table.get(arbitration_id, self.default)
+
+    def xyz_int16_scale(self):
+        """
+        Return the counts-per-unit factor that stores every decoded x, y, z value exactly as
+        int16 (e.g. 1000 for int16 signals with scale 0.001), or None if the x/y/z decoders
+        use wider or float types or different scales.
+        """
+        decoders = [d for d in set(self._table.values()) | {self.default} if d is not None and d.xyz_order is not None]
+        if not decoders:
+            return None
+        types = {d.signal_types[i] for d in decoders for i in d.xyz_order}
+        scales = {d.scales[i] for d in decoders for i in d.xyz_order}
+        if not types <= {'int8', 'uint8', 'int16'} or len(scales) != 1:
+            return None
+        scale = scales.pop()
+        if scale == 0:
+            return None
+        factor = 1.0 / scale
+        return round(factor) if abs(factor - round(factor)) < 1e-9 * abs(factor) else factor
+
+
+def load_decoder_registry(path=None, log_callback=None):
+    """
+    Load the decoder registry from a JSON config file.
+    The path defaults to $RUMIA_DECODERS or the bundled assets/decoders.json; the built-in
+    inclinometer layout is used if the file is missing or invalid.
+    """
+    log_callback = log_callback or print
+    path = path or os.environ.get('RUMIA_DECODERS') or resource_path(DEFAULT_CONFIG_PATH)
+    try:
+        with open(path) as f:
+            config = json.load(f)
+        return DecoderRegistry.from_config(config)
+    except FileNotFoundError:
+        log_callback(f"Decoder config {path} not found, using the built-in frame layout.")
+    except (OSError, ValueError, KeyError, TypeError) as e:
+        log_callback(f"Invalid decoder config {path}: {e}. Using the built-in frame layout.")
+    return DecoderRegistry.from_config(DEFAULT_CONFIG)
@@ -1,14 +1,34 @@
 from PIL import Image, ImageTk
 import customtkinter as ctk
+import tkinter as tk
 import csv
+import datetime
 import queue
+import threading
+import time
+import numpy as np
 from serial.tools import list_ports
 
-from utils import resource_path, decimal_to_hex_msb_lsb
+from utils import resource_path, CSV_HEADER
 from plotting import setup_plot_figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from can_interface import CanController
-from plot_manager import PlotManager
+from plot_manager import PlotManager, PLOT_SERIES, RedrawScheduler
+from sdo_client import SdoClient
+from signal_graph import DERIVED_SIGNALS, NodeStreamingSignals
+from spectrum import SpectrumManager
+from rolling_stats import RollingStats, STAT_NAMES
+from event_capture import EventCapture, TriggerCondition, TRIGGER_MODES, TRIGGER_DIRECTIONS
+from chunk_store import ChunkStoreWriter, ChunkStoreReader, CODECS, SCALE
+from csv_export import export_rows, memory_blocks, recording_blocks
+from offscreen_renderer import OffscreenPlotRenderer
+from sample_stream import SampleStreamServer, DROP_POLICIES
+from alarm_engine import AlarmEngine, load_alarm_rules
+
+# Seconds of data kept for display in trigger/recording mode (data goes to disk instead)
+TRIGGER_DISPLAY_SECONDS = 60
+# Refresh interval of the bus traffic view
+TRAFFIC_REFRESH_MS = 1000
 
 
 class CanInterfaceApp(ctk.CTk):
@@ -26,16 +46,39 @@ class CanInterfaceApp(ctk.CTk):
 
         # Initialize controllers and state
         self.can_controller = CanController(log_callback=self.log_message)
+        # SDO transfers run on a worker thread during start: messages are posted to the Tk loop
+        self.sdo_client = SdoClient(self.can_controller, log_callback=lambda message: self.after(0, self.log_message, message))
+        self.sdo_config_thread = None
         self.data_points = []
         self.acquisition_active = False
         self.data_queue = queue.Queue()
         self.sampling_frequency = 0
         self.update_plot_id = None
+        self.redraw_scheduler = RedrawScheduler()
+        self.custom_periodic_task = None
+        self.stream_signals = None
+        self.rolling_stats = None
+        self.event_capture = None
+        self.chunk_writer = None
+        self.data_version = 0
+        self.offscreen_renderer = None
+        self.offscreen_poll_id = None
+        self.offscreen_image = None
+        self.offscreen_render_start = None
+        self.offscreen_last_error = None
+        self.sample_stream = None
+        self.node_signals = {}
+        self.traffic_update_id = None
+        self.alarm_engine = None
 
         ctk.set_appearance_mode("System")
         ctk.set_default_color_theme("blue")
 
         self._create_controls()
+        self._create_trigger_controls()
+        self._create_recording_controls()
+        self._create_stream_controls()
+        self._create_alarm_controls()
         self._create_log_area()
         self._create_plot_area()
 
@@ -65,83 +108,105 @@ class CanInterfaceApp(ctk.CTk):
         self.entry_sampling = ctk.CTkEntry(self.controls_frame, placeholder_text="Es. 1000")
         self.entry_sampling.grid(row=0, column=1, padx=10, pady=5, sticky="ew")
 
+        # Sensor node IDs configured via SDO
+        self.label_node_ids = ctk.CTkLabel(self.controls_frame, text="Node ID sensori (hex, es. 1D,1E):")
+        self.label_node_ids.grid(row=1, column=0, padx=10, pady=5, sticky="w")
+        self.node_ids_var = ctk.StringVar(value="1D")
+        self.entry_node_ids = ctk.CTkEntry(self.controls_frame, textvariable=self.node_ids_var)
+        self.entry_node_ids.grid(row=1, column=1, padx=10, pady=5, sticky="ew")
+
         # COM port selection (SLCAN)
         self.label_com = ctk.CTkLabel(self.controls_frame, text="Porta COM (SLCAN):")
-        self.label_com.grid(row=1, column=0, padx=10, pady=5, sticky="w")
+        self.label_com.grid(row=2, column=0, padx=10, pady=5, sticky="w")
         self.com_var = ctk.StringVar(value="Auto")
         self.com_menu = ctk.CTkOptionMenu(self.controls_frame, values=["Auto"], variable=self.com_var)
-        self.com_menu.grid(row=1, column=1, padx=10, pady=5, sticky="ew")
+        self.com_menu.grid(row=2, column=1, padx=10, pady=5, sticky="ew")
         self.button_refresh_com = ctk.CTkButton(self.controls_frame, text="Refresh", command=self.refresh_com_ports, width=80)
-        self.button_refresh_com.grid(row=1, column=2, padx=10, pady=5, sticky="e")
+        self.button_refresh_com.grid(row=2, column=2, padx=10, pady=5, sticky="e")
 
         # CAN ID filter
         self.label_can_id_filter = ctk.CTkLabel(self.controls_frame, text="Filtra CAN ID (hex, es. 61D):")
-        self.label_can_id_filter.grid(row=2, column=0, padx=10, pady=5, sticky="w")
+        self.label_can_id_filter.grid(row=3, column=0, padx=10, pady=5, sticky="w")
         self.entry_can_id_filter = ctk.CTkEntry(self.controls_frame, placeholder_text="Lascia vuoto per tutti")
-        self.entry_can_id_filter.grid(row=2, column=1, padx=10, pady=5, sticky="ew")
+        self.entry_can_id_filter.grid(row=3, column=1, padx=10, pady=5, sticky="ew")
 
         # CSV save options
         self.checkbox_save_csv = ctk.CTkCheckBox(
             self.controls_frame, text="Salva dati su CSV", command=self.toggle_csv_filename_entry
         )
-        self.checkbox_save_csv.grid(row=3, column=0, padx=10, pady=5, sticky="w")
+        self.checkbox_save_csv.grid(row=4, column=0, padx=10, pady=5, sticky="w")
         self.entry_csv_filename = ctk.CTkEntry(self.controls_frame, placeholder_text="Nome file CSV (es. dati.csv)")
-        self.entry_csv_filename.grid(row=3, column=1, padx=10, pady=5, sticky="ew")
+        self.entry_csv_filename.grid(row=4, column=1, padx=10, pady=5, sticky="ew")
         self.entry_csv_filename.grid_remove()
+        self.checkbox_zero_phase = ctk.CTkCheckBox(self.controls_frame, text="Filtro a fase zero (export)")
+        self.checkbox_zero_phase.grid(row=4, column=2, padx=10, pady=5, sticky="w")
+
+        # Rolling statistics options
+        self.label_stats_windows = ctk.CTkLabel(self.controls_frame, text="Finestre statistiche (s, es. 1,10):")
+        self.label_stats_windows.grid(row=5, column=0, padx=10, pady=5, sticky="w")
+        self.stats_windows_var = ctk.StringVar(value="1,10")
+        self.entry_stats_windows = ctk.CTkEntry(self.controls_frame, textvariable=self.stats_windows_var)
+        self.entry_stats_windows.grid(row=5, column=1, padx=10, pady=5, sticky="ew")
+        self.checkbox_stats_csv = ctk.CTkCheckBox(self.controls_frame, text="Statistiche nel CSV")
+        self.checkbox_stats_csv.grid(row=5, column=2, padx=10, pady=5, sticky="w")
 
         # Plot selection checkboxes
         self.label_plot_selection = ctk.CTkLabel(self.controls_frame, text="Seleziona grandezze da plottare:")
-        self.label_plot_selection.grid(row=4, column=0, padx=10, pady=5, sticky="w", columnspan=2)
+        self.label_plot_selection.grid(row=6, column=0, padx=10, pady=5, sticky="w", columnspan=2)
+        self.checkbox_offscreen = ctk.CTkCheckBox(
+            self.controls_frame, text="Rendering in background", command=self.toggle_offscreen_render
+        )
+        self.checkbox_offscreen.grid(row=6, column=2, padx=10, pady=5, sticky="w")
         
         self.checkbox_plot_x_orig = ctk.CTkCheckBox(self.controls_frame, text="Plot X (Originale)")
-        self.checkbox_plot_x_orig.grid(row=5, column=0, padx=(10, 5), pady=2, sticky="w")
+        self.checkbox_plot_x_orig.grid(row=7, column=0, padx=(10, 5), pady=2, sticky="w")
         self.checkbox_plot_y_orig = ctk.CTkCheckBox(self.controls_frame, text="Plot Y (Originale)")
-        self.checkbox_plot_y_orig.grid(row=5, column=1, padx=(10, 5), pady=2, sticky="w")
+        self.checkbox_plot_y_orig.grid(row=7, column=1, padx=(10, 5), pady=2, sticky="w")
         self.checkbox_plot_z_orig = ctk.CTkCheckBox(self.controls_frame, text="Plot Z (Originale)")
-        self.checkbox_plot_z_orig.grid(row=5, column=2, padx=(10, 5), pady=2, sticky="w")
+        self.checkbox_plot_z_orig.grid(row=7, column=2, padx=(10, 5), pady=2, sticky="w")
 
         self.checkbox_plot_x_incl = ctk.CTkCheckBox(
             self.controls_frame, text="Plot X_incl (Passa-Basso)", variable=ctk.BooleanVar(value=True)
         )
-        self.checkbox_plot_x_incl.grid(row=6, column=0, padx=(10, 5), pady=2, sticky="w")
+        self.checkbox_plot_x_incl.grid(row=8, column=0, padx=(10, 5), pady=2, sticky="w")
         self.checkbox_plot_y_incl = ctk.CTkCheckBox(
             self.controls_frame, text="Plot Y_incl (Passa-Basso)", variable=ctk.BooleanVar(value=True)
         )
-        self.checkbox_plot_y_incl.grid(row=6, column=1, padx=(10, 5), pady=2, sticky="w")
+        self.checkbox_plot_y_incl.grid(row=8, column=1, padx=(10, 5), pady=2, sticky="w")
         self.checkbox_plot_z_incl = ctk.CTkCheckBox(
             self.controls_frame, text="Plot Z_incl (Passa-Basso)", variable=ctk.BooleanVar(value=True)
         )
-        self.checkbox_plot_z_incl.grid(row=6, column=2, padx=(10, 5), pady=2, sticky="w")
+        self.checkbox_plot_z_incl.grid(row=8, column=2, padx=(10, 5), pady=2, sticky="w")
 
         self.checkbox_plot_x_acc = ctk.CTkCheckBox(self.controls_frame, text="Plot X_acc (Passa-Alto)")
-        self.checkbox_plot_x_acc.grid(row=7, column=0, padx=(10, 5), pady=2, sticky="w")
+        self.checkbox_plot_x_acc.grid(row=9, column=0, padx=(10, 5), pady=2, sticky="w")
         self.checkbox_plot_y_acc = ctk.CTkCheckBox(self.controls_frame, text="Plot Y_acc (Passa-Alto)")
-        self.checkbox_plot_y_acc.grid(row=7, column=1, padx=(10, 5), pady=2, sticky="w")
+        self.checkbox_plot_y_acc.grid(row=9, column=1, padx=(10, 5), pady=2, sticky="w")
         self.checkbox_plot_z_acc = ctk.CTkCheckBox(self.controls_frame, text="Plot Z_acc (Passa-Alto)")
-        self.checkbox_plot_z_acc.grid(row=7, column=2, padx=(10, 5), pady=2, sticky="w")
+        self.checkbox_plot_z_acc.grid(row=9, column=2, padx=(10, 5), pady=2, sticky="w")
 
         self.checkbox_plot_tetha_xz = ctk.CTkCheckBox(
             self.controls_frame, text="Plot Tetha_XZ [deg]", variable=ctk.BooleanVar(value=True)
         )
-        self.checkbox_plot_tetha_xz.grid(row=8, column=0, padx=(10, 5), pady=2, sticky="w")
+        self.checkbox_plot_tetha_xz.grid(row=10, column=0, padx=(10, 5), pady=2, sticky="w")
         self.checkbox_plot_tetha_yz = ctk.CTkCheckBox(
             self.controls_frame, text="Plot Tetha_YZ [deg]", variable=ctk.BooleanVar(value=True)
         )
-        self.checkbox_plot_tetha_yz.grid(row=8, column=1, padx=(10, 5), pady=2, sticky="w")
+        self.checkbox_plot_tetha_yz.grid(row=10, column=1, padx=(10, 5), pady=2, sticky="w")
 
         # Action buttons
         self.button_start = ctk.CTkButton(
             self.controls_frame, text="Invia e Avvia Acquisizione", command=self.start_acquisition
         )
-        self.button_start.grid(row=9, column=0, padx=10, pady=10, sticky="ew")
+        self.button_start.grid(row=11, column=0, padx=10, pady=10, sticky="ew")
         self.button_stop = ctk.CTkButton(
             self.controls_frame, text="Interrompi Acquisizione", command=self.stop_acquisition, state="disabled"
         )
-        self.button_stop.grid(row=9, column=1, padx=10, pady=10, sticky="ew")
+        self.button_stop.grid(row=11, column=1, padx=10, pady=10, sticky="ew")
 
         # Custom CAN message area embedded in main GUI
         self.custom_can_frame = ctk.CTkFrame(self.controls_frame)
-        self.custom_can_frame.grid(row=10, column=0, columnspan=3, padx=10, pady=(0, 10), sticky="ew")
+        self.custom_can_frame.grid(row=12, column=0, columnspan=3, padx=10, pady=(0, 10), sticky="ew")
         try:
             self.custom_can_frame.grid_columnconfigure(0, weight=0)
             self.custom_can_frame.grid_columnconfigure(1, weight=0)
@@ -180,6 +245,16 @@ class CanInterfaceApp(ctk.CTk):
         self.custom_send_btn = ctk.CTkButton(self.custom_can_frame, text="Send", command=self.send_custom_can)
         self.custom_send_btn.grid(row=2, column=0, padx=10, pady=(4, 8), sticky="w")
 
+        # Optional cyclic transmission (empty period = single frame)
+        ctk.CTkLabel(self.custom_can_frame, text="Periodo (ms)").grid(row=2, column=1, padx=(0, 5), pady=(4, 8), sticky="e")
+        self.custom_period_var = ctk.StringVar(value="")
+        self.custom_period_entry = ctk.CTkEntry(self.custom_can_frame, textvariable=self.custom_period_var, width=70)
+        self.custom_period_entry.grid(row=2, column=2, padx=(0, 10), pady=(4, 8), sticky="w")
+        self.custom_stop_btn = ctk.CTkButton(
+            self.custom_can_frame, text="Stop", command=self.stop_custom_periodic, state="disabled", width=60
+        )
+        self.custom_stop_btn.grid(row=2, column=3, padx=(0, 10), pady=(4, 8), sticky="w")
+
         def _custom_update_data_state(*_):
             try:
                 n = int(self.custom_dlc_var.get())
@@ -196,6 +271,232 @@ class CanInterfaceApp(ctk.CTk):
         self.custom_dlc_var.trace_add("write", lambda *_: _custom_update_data_state())
         _custom_update_data_state()
 
+    def _create_trigger_controls(self):
+        """Create the triggered event capture options below the custom CAN panel."""
+        self.trigger_frame = ctk.CTkFrame(self.controls_frame)
+        self.trigger_frame.grid(row=13, column=0, columnspan=3, padx=10, pady=(0, 10), sticky="ew")
+
+        self.checkbox_trigger = ctk.CTkCheckBox(self.trigger_frame, text="Modalità trigger (salva solo eventi)")
+        self.checkbox_trigger.grid(row=0, column=0, columnspan=2, padx=10, pady=(8, 4), sticky="w")
+
+        ctk.CTkLabel(self.trigger_frame, text="Segnale").grid(row=1, column=0, padx=(10, 5), pady=4, sticky="w")
+        self.trigger_signal_var = ctk.StringVar(value="tetha_xz")
+        ctk.CTkOptionMenu(
+            self.trigger_frame, values=['x', 'y', 'z'] + list(DERIVED_SIGNALS), variable=self.trigger_signal_var, width=100
+        ).grid(row=1, column=1, padx=(0, 10), pady=4, sticky="w")
+        ctk.CTkLabel(self.trigger_frame, text="Condizione").grid(row=1, column=2, padx=(0, 5), pady=4, sticky="w")
+        self.trigger_mode_var = ctk.StringVar(value="threshold")
+        ctk.CTkOptionMenu(
+            self.trigger_frame, values=list(TRIGGER_MODES), variable=self.trigger_mode_var, width=100
+        ).grid(row=1, column=3, padx=(0, 10), pady=4, sticky="w")
+        self.trigger_direction_var = ctk.StringVar(value="above")
+        ctk.CTkOptionMenu(
+            self.trigger_frame, values=list(TRIGGER_DIRECTIONS), variable=self.trigger_direction_var, width=80
+        ).grid(row=1, column=4, padx=(0, 10), pady=4, sticky="w")
+
+        ctk.CTkLabel(self.trigger_frame, text="Soglia (window: min,max)").grid(row=2, column=0, padx=(10, 5), pady=4, sticky="w")
+        self.trigger_level_var = ctk.StringVar(value="5")
+        ctk.CTkEntry(self.trigger_frame, textvariable=self.trigger_level_var, width=100).grid(
+            row=2, column=1, padx=(0, 10), pady=4, sticky="w"
+        )
+        ctk.CTkLabel(self.trigger_frame, text="Pre/Post (s)").grid(row=2, column=2, padx=(0, 5), pady=4, sticky="w")
+        self.trigger_pre_var = ctk.StringVar(value="2")
+        ctk.CTkEntry(self.trigger_frame, textvariable=self.trigger_pre_var, width=50).grid(
+            row=2, column=3, padx=(0, 5), pady=4, sticky="w"
+        )
+        self.trigger_post_var = ctk.StringVar(value="3")
+        ctk.CTkEntry(self.trigger_frame, textvariable=self.trigger_post_var, width=50).grid(
+            row=2, column=4, padx=(0, 10), pady=4, sticky="w"
+        )
+
+        ctk.CTkLabel(self.trigger_frame, text="Cartella eventi").grid(row=3, column=0, padx=(10, 5), pady=(4, 8), sticky="w")
+        self.trigger_dir_var = ctk.StringVar(value="eventi")
+        ctk.CTkEntry(self.trigger_frame, textvariable=self.trigger_dir_var).grid(
+            row=3, column=1, columnspan=4, padx=(0, 10), pady=(4, 8), sticky="ew"
+        )
+
+    def build_event_capture(self):
+        """Create the EventCapture from the trigger controls. Returns None (after logging) if invalid."""
+        try:
+            mode = self.trigger_mode_var.get()
+            level_txt = self.trigger_level_var.get().strip()
+            if mode == 'window':
+                low, high = (float(v) for v in level_txt.split(','))
+                condition = TriggerCondition(self.trigger_signal_var.get(), mode, low=low, high=high)
+            else:
+                condition = TriggerCondition(
+                    self.trigger_signal_var.get(), mode, float(level_txt), self.trigger_direction_var.get()
+                )
+            pre_seconds = float(self.trigger_pre_var.get())
+            post_seconds = float(self.trigger_post_var.get())
+            if pre_seconds < 0 or post_seconds <= 0:
+                raise ValueError("pre must be >= 0 and post > 0 seconds")
+        except ValueError as e:
+            self.log_message(f"Parametri trigger non validi: {e}")
+            return None
+        output_dir = self.trigger_dir_var.get().strip() or "."
+        self.log_message(f"Modalità trigger attiva: {condition.describe()}, pre {pre_seconds} s, post {post_seconds} s -> {output_dir}")
+        return EventCapture(
+            [condition], self.sampling_frequency, pre_seconds, post_seconds, output_dir, log_callback=self.log_message
+        )
+
+    def _create_recording_controls(self):
+        """Create the compressed chunk-store recording and playback options."""
+        self.recording_frame = ctk.CTkFrame(self.controls_frame)
+        self.recording_frame.grid(row=14, column=0, columnspan=3, padx=10, pady=(0, 10), sticky="ew")
+
+        self.checkbox_record = ctk.CTkCheckBox(self.recording_frame, text="Registra su disco (chunk compressi)")
+        self.checkbox_record.grid(row=0, column=0, columnspan=2, padx=10, pady=(8, 4), sticky="w")
+        self.record_codec_var = ctk.StringVar(value="zlib")
+        ctk.CTkOptionMenu(self.recording_frame, values=list(CODECS), variable=self.record_codec_var, width=80).grid(
+            row=0, column=2, padx=(0, 10), pady=(8, 4), sticky="w"
+        )
+
+        ctk.CTkLabel(self.recording_frame, text="Cartella registrazione").grid(row=1, column=0, padx=(10, 5), pady=4, sticky="w")
+        self.record_dir_var = ctk.StringVar(value="registrazione")
+        ctk.CTkEntry(self.recording_frame, textvariable=self.record_dir_var).grid(
+            row=1, column=1, columnspan=3, padx=(0, 10), pady=4, sticky="ew"
+        )
+
+        ctk.CTkLabel(self.recording_frame, text="Da / A (YYYY-MM-DD HH:MM:SS)").grid(row=2, column=0, padx=(10, 5), pady=(4, 8), sticky="w")
+        self.record_from_var = ctk.StringVar(value="")
+        ctk.CTkEntry(self.recording_frame, textvariable=self.record_from_var, width=150).grid(
+            row=2, column=1, padx=(0, 5), pady=(4, 8), sticky="w"
+        )
+        self.record_to_var = ctk.StringVar(value="")
+        ctk.CTkEntry(self.recording_frame, textvariable=self.record_to_var, width=150).grid(
+            row=2, column=2, padx=(0, 5), pady=(4, 8), sticky="w"
+        )
+        self.button_show_recording = ctk.CTkButton(
+            self.recording_frame, text="Visualizza", command=self.show_recording, width=80
+        )
+        self.button_show_recording.grid(row=2, column=3, padx=(0, 10), pady=(4, 8), sticky="w")
+
+    def _create_stream_controls(self):
+        """Create the local sample stream (publish/subscribe) options."""
+        self.stream_frame = ctk.CTkFrame(self.controls_frame)
+        self.stream_frame.grid(row=15, column=0, columnspan=3, padx=10, pady=(0, 10), sticky="ew")
+
+        self.checkbox_stream = ctk.CTkCheckBox(
+            self.stream_frame, text="Pubblica campioni (socket locale)", command=self.toggle_sample_stream
+        )
+        self.checkbox_stream.grid(row=0, column=0, columnspan=2, padx=10, pady=(8, 4), sticky="w")
+
+        ctk.CTkLabel(self.stream_frame, text="Indirizzo (host:porta o path)").grid(row=1, column=0, padx=(10, 5), pady=(4, 8), sticky="w")
+        self.stream_address_var = ctk.StringVar(value="127.0.0.1:5555")
+        ctk.CTkEntry(self.stream_frame, textvariable=self.stream_address_var, width=150).grid(
+            row=1, column=1, padx=(0, 5), pady=(4, 8), sticky="w"
+        )
+        self.stream_drop_var = ctk.StringVar(value=DROP_POLICIES[0])
+        ctk.CTkOptionMenu(self.stream_frame, values=list(DROP_POLICIES), variable=self.stream_drop_var, width=90).grid(
+            row=1, column=2, padx=(0, 10), pady=(4, 8), sticky="w"
+        )
+
+    def _create_alarm_controls(self):
+        """Create the limit alarm options (rules file and event export)."""
+        self.alarm_frame = ctk.CTkFrame(self.controls_frame)
+        self.alarm_frame.grid(row=16, column=0, columnspan=3, padx=10, pady=(0, 10), sticky="ew")
+
+        self.checkbox_alarms = ctk.CTkCheckBox(self.alarm_frame, text="Allarmi su limiti (per nodo)")
+        self.checkbox_alarms.grid(row=0, column=0, columnspan=2, padx=10, pady=(8, 4), sticky="w")
+
+        ctk.CTkLabel(self.alarm_frame, text="File limiti (JSON)").grid(row=1, column=0, padx=(10, 5), pady=4, sticky="w")
+        self.alarm_rules_var = ctk.StringVar(value=resource_path("assets/alarms.json"))
+        ctk.CTkEntry(self.alarm_frame, textvariable=self.alarm_rules_var).grid(
+            row=1, column=1, columnspan=2, padx=(0, 10), pady=4, sticky="ew"
+        )
+        ctk.CTkLabel(self.alarm_frame, text="Export allarmi (CSV)").grid(row=2, column=0, padx=(10, 5), pady=(4, 8), sticky="w")
+        self.alarm_export_var = ctk.StringVar(value="allarmi.csv")
+        ctk.CTkEntry(self.alarm_frame, textvariable=self.alarm_export_var).grid(
+            row=2, column=1, columnspan=2, padx=(0, 10), pady=(4, 8), sticky="ew"
+        )
+        self.alarm_frame.grid_columnconfigure(1, weight=1)
+
+    def build_alarm_engine(self):
+        """Create the AlarmEngine from the rules file. Returns None (after logging) if invalid."""
+        path = self.alarm_rules_var.get().strip()
+        try:
+            rules = load_alarm_rules(path)
+            for rule in rules:
+                if rule.signal not in ('x', 'y', 'z') + DERIVED_SIGNALS:
+                    raise ValueError(f"unknown signal '{rule.signal}'")
+        except (OSError, ValueError, TypeError) as e:
+            self.log_message(f"Limiti allarmi non validi ({path}): {e}")
+            return None
+        if not rules:
+            self.log_message(f"Nessuna regola di allarme in {path}.")
+            return None
+        self.log_message(f"Allarmi attivi: {len(rules)} regole da {path}")
+        return AlarmEngine(rules, self.sampling_frequency, log_callback=self.log_message)
+
+    def toggle_sample_stream(self):
+        """Start or stop publishing decoded samples to local subscribers."""
+        if self.sample_stream is not None:
+            self.sample_stream.close()
+            self.sample_stream = None
+            self.log_message("Stream campioni chiuso.")
+        if self.checkbox_stream.get() != 1:
+            return
+        try:
+            server = SampleStreamServer(
+                self.stream_address_var.get(), drop_policy=self.stream_drop_var.get(),
+                # Connection messages come from the accept/sender threads
+                log_callback=lambda message: self.after(0, self.log_message, message)
+            )
+        except ValueError as e:
+            self.log_message(f"Stream campioni non valido: {e}")
+            self.checkbox_stream.deselect()
+            return
+        if server.start():
+            self.sample_stream = server
+        else:
+            self.checkbox_stream.deselect()
+
+    def _parse_recording_range(self):
+        """Parse the playback time range. Returns (t_start, t_end) or None if invalid."""
+        bounds = []
+        for var in (self.record_from_var, self.record_to_var):
+            text = var.get().strip()
+            if not text:
+                bounds.append(None)
+                continue
+            try:
+                bounds.append(datetime.datetime.fromisoformat(text))
+            except ValueError:
+                self.log_message(f"Data/ora non valida: '{text}'.")
+                return None
+        return tuple(bounds)
+
+    def _recording_can_id(self):
+        """CAN ID selected with the filter entry, normalized like the stored IDs (None = all)."""
+        text = self.entry_can_id_filter.get().strip()
+        if not text:
+            return None
+        try:
+            return f"{int(text, 16):X}"
+        except ValueError:
+            self.log_message("CAN ID filter non valido, mostro tutti i nodi.")
+            return None
+
+    def show_recording(self):
+        """Plot the selected time range (and CAN ID filter) from the recording directory."""
+        if self.acquisition_active:
+            self.log_message("Interrompere l'acquisizione prima di visualizzare una registrazione.")
+            return
+        time_range = self._parse_recording_range()
+        if time_range is None:
+            return
+        reader = ChunkStoreReader(self.record_dir_var.get().strip() or ".")
+        if not reader.index:
+            self.log_message("Nessuna registrazione trovata nella cartella indicata.")
+            return
+        # Playback is drawn on the Tk canvas, which is hidden while background rendering is on
+        self._show_plot_widget(offscreen=False)
+        count = self.plot_manager.plot_recording(
+            reader, self.get_plot_options(), time_range[0], time_range[1], self._recording_can_id()
+        )
+        self.log_message(f"Registrazione: {count} campioni visualizzati.")
+
     def _create_log_area(self):
         """Create the log textbox at the bottom."""
         self.log_textbox = ctk.CTkTextbox(self, height=150)
@@ -213,24 +514,49 @@ class CanInterfaceApp(ctk.CTk):
 
         # Setup plot with dark theme
         self.fig, self.ax = setup_plot_figure(figsize=(8, 6))
-        try:
-            self.fig.set_facecolor('#2B2B2B')
-        except Exception:
-            pass
-        self.ax.set_facecolor('#2B2B2B')
-        self.ax.tick_params(axis='x', colors='white')
-        self.ax.tick_params(axis='y', colors='white')
-        for spine in ('bottom', 'top', 'left', 'right'):
-            self.ax.spines[spine].set_color('white')
-        self.ax.xaxis.label.set_color('white')
-        self.ax.yaxis.label.set_color('white')
-        self.ax.title.set_color('white')
+        self._apply_dark_theme(self.fig, self.ax)
 
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_frame)
         self.canvas.get_tk_widget().grid(row=0, column=0, sticky="nsew")
 
+        # Target of the background renderer: finished frames are blitted here as images
+        self.offscreen_canvas = tk.Canvas(self.plot_frame, highlightthickness=0, bg='#2B2B2B')
+
+        # Live spectrum (PSD) of the high-pass signals below the time plot
+        self.plot_frame.grid_rowconfigure(1, weight=0)
+        self.spectrum_fig, self.spectrum_ax = setup_plot_figure(figsize=(8, 2.5))
+        self._apply_dark_theme(self.spectrum_fig, self.spectrum_ax)
+        self.spectrum_canvas = FigureCanvasTkAgg(self.spectrum_fig, master=self.plot_frame)
+        self.spectrum_canvas.get_tk_widget().grid(row=1, column=0, sticky="nsew")
+
+        # Rolling statistics table
+        self.stats_textbox = ctk.CTkTextbox(self.plot_frame, height=110, font=("Courier", 11))
+        self.stats_textbox.grid(row=2, column=0, sticky="nsew", pady=(5, 0))
+        self.stats_textbox.configure(state="disabled")
+
+        # Bus traffic monitor (per-ID rates, bus load, error counters)
+        self.traffic_textbox = ctk.CTkTextbox(self.plot_frame, height=110, font=("Courier", 11))
+        self.traffic_textbox.grid(row=3, column=0, sticky="nsew", pady=(5, 0))
+        self.traffic_textbox.configure(state="disabled")
+
         # Initialize PlotManager
         self.plot_manager = PlotManager(self.ax, self.canvas, cutoff_lowpass=1.0, cutoff_highpass=1.0)
+        self.spectrum_manager = SpectrumManager(self.spectrum_ax, self.spectrum_canvas)
+
+    def _apply_dark_theme(self, fig, ax):
+        """Apply the dark theme colors to a figure and its axes."""
+        try:
+            fig.set_facecolor('#2B2B2B')
+        except Exception:
+            pass
+        ax.set_facecolor('#2B2B2B')
+        ax.tick_params(axis='x', colors='white')
+        ax.tick_params(axis='y', colors='white')
+        for spine in ('bottom', 'top', 'left', 'right'):
+            ax.spines[spine].set_color('white')
+        ax.xaxis.label.set_color('white')
+        ax.yaxis.label.set_color('white')
+        ax.title.set_color('white')
 
     def log_message(self, message):
         """Add a message to the log textbox."""
@@ -278,7 +604,7 @@ class CanInterfaceApp(ctk.CTk):
 
     def start_acquisition(self):
         """Start CAN data acquisition."""
-        if self.acquisition_active:
+        if self.acquisition_active or self.sdo_config_thread is not None:
             self.log_message("Acquisition already in progress.")
             return
 
@@ -294,24 +620,91 @@ class CanInterfaceApp(ctk.CTk):
             self.log_message("Enter a valid integer (non-zero) for the interval.")
             return
 
-        # Ensure CAN bus is ready
-        if not self.ensure_can_bus_initialized():
+        node_ids = self.parse_node_ids()
+        if node_ids is None:
             return
 
-        # Send CAN configuration message
-        msb, lsb = decimal_to_hex_msb_lsb(sampling_interval)
-        can_message = f'2B001805{msb}{lsb}0000'
-        self.log_message(f"Sending CAN message: can0 61D#{can_message}")
-        self.send_can_message_gui('can0', '61D', can_message)
-
         # Validate CSV filename if saving
         if self.checkbox_save_csv.get() == 1 and not self.entry_csv_filename.get():
             self.log_message("Please enter a CSV filename.")
             return
 
+        stats_windows = self.parse_stats_windows()
+        if stats_windows is None:
+            return
+
+        event_capture = None
+        if self.checkbox_trigger.get() == 1:
+            event_capture = self.build_event_capture()
+            if event_capture is None:
+                return
+
+        alarm_engine = None
+        if self.checkbox_alarms.get() == 1:
+            alarm_engine = self.build_alarm_engine()
+            if alarm_engine is None:
+                return
+
+        # Reload the decoder config so edits take effect, and size the recording resolution on it
+        decoders = self.can_controller.load_decoders()
+
+        chunk_writer = None
+        if self.checkbox_record.get() == 1:
+            record_dir = self.record_dir_var.get().strip() or "."
+            storage_scale = decoders.xyz_int16_scale()
+            if storage_scale is None:
+                storage_scale = SCALE
+                self.log_message(
+                    f"Attenzione: i decoder x/y/z non sono rappresentabili esattamente in int16; la registrazione "
+                    f"arrotonda a 1/{SCALE} e satura a ±{32767 / SCALE:g}."
+                )
+            try:
+                chunk_writer = ChunkStoreWriter(
+                    record_dir, codec=self.record_codec_var.get(),
+                    metadata={'sampling_frequency': self.sampling_frequency}, scale=storage_scale
+                )
+            except (OSError, ValueError) as e:
+                self.log_message(f"Impossibile avviare la registrazione: {e}")
+                return
+            self.log_message(f"Registrazione su disco in {record_dir} ({self.record_codec_var.get()}).")
+
+        # Ensure CAN bus is ready
+        if not self.ensure_can_bus_initialized():
+            if chunk_writer is not None:
+                chunk_writer.close()
+            return
+
+        # All inputs are valid: configure the TPDO1 event timer (0x1800 sub 5, UNSIGNED16 ms) on all
+        # nodes via SDO off the Tk thread, then start acquiring
+        self.button_start.configure(state="disabled")
+
+        def configure_nodes():
+            self.configure_sampling_interval(node_ids, sampling_interval)
+            self.after(0, self._begin_acquisition, stats_windows, event_capture, alarm_engine, chunk_writer)
+
+        self.sdo_config_thread = threading.Thread(target=configure_nodes, daemon=True)
+        self.sdo_config_thread.start()
+
+    def _begin_acquisition(self, stats_windows, event_capture, alarm_engine, chunk_writer):
+        """Second half of start_acquisition, on the Tk thread once the nodes are configured."""
+        self.sdo_config_thread = None
+
         # Clear previous data and plot
         self.data_points = []
+        self.data_version += 1
+        self.event_capture = event_capture
+        self.alarm_engine = alarm_engine
+        self.chunk_writer = chunk_writer
         self.plot_manager.clear_plot()
+        self.stream_signals = NodeStreamingSignals(
+            self.sampling_frequency, self.plot_manager.cutoff_lowpass, self.plot_manager.cutoff_highpass
+        )
+        self.spectrum_manager.reset(self.sampling_frequency)
+        # Rolling statistics for the signals selected for plotting
+        plot_options = self.get_plot_options()
+        stats_signals = [name for key, name, _, _ in PLOT_SERIES if plot_options.get(key)]
+        self.rolling_stats = RollingStats(stats_signals, stats_windows)
+        self._show_stats_text("")
 
         # Update UI state
         self.acquisition_active = True
@@ -342,21 +735,106 @@ class CanInterfaceApp(ctk.CTk):
                     return
             self.data_queue.put((timestamp, can_id, x, y, z))
         
+        def signal_received(timestamp, can_id, decoder_name, values):
+            # Other node types (see assets/decoders.json): keep the latest reading per node
+            self.node_signals[can_id] = (timestamp, decoder_name, values)
+
         def should_stop():
             return not self.acquisition_active
         
-        self.can_controller.start_reader(data_received, should_stop)
+        self.node_signals = {}
+        self.can_controller.start_reader(data_received, should_stop, signal_received)
 
         # Start plot update cycle
+        self.redraw_scheduler.invalidate()
         self.update_plot()
+        if self.traffic_update_id:
+            self.after_cancel(self.traffic_update_id)
+        self.traffic_update_id = self.after(TRAFFIC_REFRESH_MS, self.update_traffic_view)
+
+    def parse_node_ids(self):
+        """Parse the comma-separated node ID list. Returns list of ints or None if invalid."""
+        text = self.node_ids_var.get().replace(' ', ',')
+        node_ids = []
+        for part in text.split(','):
+            part = part.strip()
+            if not part:
+                continue
+            try:
+                node_id = int(part, 16)
+            except ValueError:
+                self.log_message(f"Node ID non valido: '{part}'.")
+                return None
+            if not 1 <= node_id <= 0x7F:
+                self.log_message(f"Node ID fuori range (01-7F): '{part}'.")
+                return None
+            if node_id not in node_ids:
+                node_ids.append(node_id)
+        if not node_ids:
+            self.log_message("Inserire almeno un Node ID.")
+            return None
+        return node_ids
+
+    def configure_sampling_interval(self, node_ids, sampling_interval):
+        """
+        Write the sampling interval to every node with pipelined SDO downloads and check the responses.
+        Runs on a worker thread: messages are posted to the log through the Tk loop.
+        """
+        def log(message):
+            self.after(0, self.log_message, message)
+
+        log(
+            f"Configuring sampling interval {sampling_interval} ms via SDO on nodes: "
+            f"{', '.join(f'{n:02X}' for n in node_ids)}"
+        )
+        start = time.monotonic()
+        results = self.sdo_client.write_many([(n, 0x1800, 0x05, sampling_interval, 2) for n in node_ids])
+        failed = [n for n, ok in zip(node_ids, results) if not ok]
+        if failed:
+            log(f"Configurazione SDO non confermata dai nodi: {', '.join(f'{n:02X}' for n in failed)}")
+        else:
+            log(f"Configurazione SDO confermata da tutti i nodi ({time.monotonic() - start:.2f} s).")
+        return not failed
 
     def process_data_queue(self):
         """Process incoming data from the queue."""
+        new_points = []
         while not self.data_queue.empty():
-            data = self.data_queue.get()
-            self.data_points.append(data)
+            new_points.append(self.data_queue.get())
+        if new_points:
+            self.data_points.extend(new_points)
+            self.data_version += 1
+            if self.event_capture is not None or self.chunk_writer is not None:
+                # Trigger/recording mode: keep only a bounded display window, data goes to disk
+                max_points = max(1000, int(self.sampling_frequency * TRIGGER_DISPLAY_SECONDS))
+                if len(self.data_points) > 2 * max_points:
+                    del self.data_points[:-max_points]
+            self._ingest_chunk(new_points)
         self.after(100, self.process_data_queue)
 
+    def _ingest_chunk(self, points):
+        """Feed newly received samples to the streaming consumers (filters, spectrum, statistics, trigger, recording)."""
+        if self.stream_signals is None:
+            return
+        x = np.fromiter((p[2] for p in points), dtype=float, count=len(points))
+        y = np.fromiter((p[3] for p in points), dtype=float, count=len(points))
+        z = np.fromiter((p[4] for p in points), dtype=float, count=len(points))
+        can_ids = [p[1] for p in points]
+        # The chunk interleaves all nodes: the filters and every stateful consumer below
+        # (spectrum, statistics, trigger, alarms) split it by CAN ID themselves
+        chunk = self.stream_signals.process(can_ids, x, y, z)
+        self.spectrum_manager.push(chunk, can_ids)
+        if self.rolling_stats is not None:
+            self.rolling_stats.push_chunk([p[0].timestamp() for p in points], chunk, can_ids)
+        if self.event_capture is not None:
+            self.event_capture.process(points, chunk)
+        if self.alarm_engine is not None:
+            self.alarm_engine.process(points, chunk)
+        if self.chunk_writer is not None:
+            self.chunk_writer.append(points)
+        if self.sample_stream is not None:
+            self.sample_stream.publish(points)
+
     def stop_acquisition(self):
         """Stop CAN data acquisition."""
         if self.acquisition_active:
@@ -375,9 +853,43 @@ class CanInterfaceApp(ctk.CTk):
 
         self.update_buttons_state()
 
-        # Save CSV if requested
-        if self.data_points and self.checkbox_save_csv.get() == 1:
-            self.save_data_to_csv()
+        if self.event_capture is not None:
+            self.event_capture.flush()
+            self.log_message(f"Eventi salvati: {self.event_capture.event_count}")
+
+        if self.alarm_engine is not None and self.alarm_engine.events:
+            alarm_filename = self.alarm_export_var.get().strip() or "allarmi.csv"
+            try:
+                self.alarm_engine.export_csv(alarm_filename)
+                self.log_message(f"{len(self.alarm_engine.events)} eventi di allarme salvati in {alarm_filename}")
+            except OSError as e:
+                self.log_message(f"Error saving alarms: {e}")
+
+        recording_dir = recording_session = None
+        if self.chunk_writer is not None:
+            writer, self.chunk_writer = self.chunk_writer, None
+            recording_dir, recording_session = writer.directory, writer.session
+            try:
+                writer.close()
+                self.log_message(f"Registrazione chiusa: {writer.samples_written} campioni in {recording_dir}")
+                if writer.clipped_samples:
+                    self.log_message(f"Attenzione: {writer.clipped_samples} campioni fuori scala saturati nella registrazione.")
+            except OSError as e:
+                self.log_message(f"Error closing recording: {e}")
+
+        # Save CSV if requested (in trigger mode only the captured events are saved)
+        if self.event_capture is not None:
+            if self.checkbox_save_csv.get() == 1:
+                self.log_message("Modalità trigger: CSV completo non salvato, vedi file eventi.")
+        elif recording_dir is not None:
+            if self.checkbox_save_csv.get() == 1:
+                # Only this acquisition, streamed from disk: the directory may hold earlier sessions
+                zero_phase = self.checkbox_zero_phase.get() == 1
+                reader = ChunkStoreReader(recording_dir)
+                self.save_data_to_csv(recording_blocks(reader, recording_session, by_node=zero_phase), zero_phase)
+        elif self.data_points and self.checkbox_save_csv.get() == 1:
+            zero_phase = self.checkbox_zero_phase.get() == 1
+            self.save_data_to_csv(memory_blocks(self.data_points, by_node=zero_phase), zero_phase)
         elif not self.data_points:
             self.log_message("No data acquired.")
 
@@ -391,14 +903,113 @@ class CanInterfaceApp(ctk.CTk):
             self.button_stop.configure(state="disabled")
 
     def update_plot(self):
-        """Update the plot with current data using PlotManager."""
-        if not self.acquisition_active or len(self.data_points) < 2:
-            if self.acquisition_active:
-                self.update_plot_id = self.after(500, self.update_plot)
+        """
+        Update the plot with current data using PlotManager.
+        Renders only when new samples arrived or the plot options changed; the next tick is
+        scheduled with the interval adapted by the RedrawScheduler.
+        """
+        if not self.acquisition_active:
             return
-
-        # Get plot options from checkboxes
-        plot_options = {
+        if len(self.data_points) >= 2:
+            plot_options = self.get_plot_options()
+            key = (self.data_version, tuple(sorted(plot_options.items())))
+            if self.offscreen_renderer is not None:
+                if self.redraw_scheduler.needs_render(key):
+                    self._update_plot_offscreen(plot_options, key)
+            elif self.redraw_scheduler.needs_render(key):
+                start = time.perf_counter()
+                # Delegate to PlotManager
+                self.plot_manager.process_and_plot(
+                    self.data_points, self.sampling_frequency, plot_options, data_version=self.data_version
+                )
+                self.spectrum_manager.plot()
+                self._show_stats_text(self._stats_panel_text())
+                self.redraw_scheduler.record_render(key, time.perf_counter() - start)
+
+        self.update_plot_id = self.after(self.redraw_scheduler.interval_ms, self.update_plot)
+
+    def _update_plot_offscreen(self, plot_options, key):
+        """Submit a snapshot to the background renderer; the other panels are still drawn here."""
+        if self.offscreen_renderer.busy:
+            # Previous frame not finished yet: keep the key unrendered and retry next tick
+            return
+        start = time.perf_counter()
+        self.offscreen_renderer.request(
+            self.data_points, self.sampling_frequency, plot_options, self.data_version,
+            (self.offscreen_canvas.winfo_width(), self.offscreen_canvas.winfo_height())
+        )
+        self.spectrum_manager.plot()
+        self._show_stats_text(self._stats_panel_text())
+        self.offscreen_render_start = (key, time.perf_counter() - start)
+        if self.offscreen_poll_id is None:
+            self.offscreen_poll_id = self.after(30, self._poll_offscreen_frame)
+
+    def _poll_offscreen_frame(self):
+        """Blit the newest frame produced by the background renderer, if any."""
+        self.offscreen_poll_id = None
+        if self.offscreen_renderer is None:
+            return
+        # Read busy first: a frame finishing after this check is picked up by the next poll
+        pending = self.offscreen_renderer.busy
+        result = self.offscreen_renderer.take_result()
+        error = self.offscreen_renderer.take_error()
+        if error is not None:
+            # Log each distinct failure once; the key is still recorded so the same data is not retried
+            if error != self.offscreen_last_error:
+                self.log_message(f"Error rendering plot in background: {error}")
+            self.offscreen_last_error = error
+        if result is not None:
+            self.offscreen_last_error = None
+            # A recording may have been shown on the Tk canvas meanwhile: live frames take the slot back
+            self._show_plot_widget(offscreen=True)
+            buffer, width, height = result
+            image = Image.frombuffer('RGBA', (width, height), buffer, 'raw', 'RGBA', 0, 1)
+            if self.offscreen_image is not None and (self.offscreen_image.width(), self.offscreen_image.height()) == (width, height):
+                self.offscreen_image.paste(image)
+            else:
+                self.offscreen_image = ImageTk.PhotoImage(image)
+                self.offscreen_canvas.delete("all")
+                self.offscreen_canvas.create_image(0, 0, image=self.offscreen_image, anchor="nw")
+        if result is not None or error is not None:
+            if self.offscreen_render_start is not None:
+                key, main_thread_s = self.offscreen_render_start
+                self.offscreen_render_start = None
+                self.redraw_scheduler.record_render(key, main_thread_s + self.offscreen_renderer.last_render_s)
+        if pending:
+            self.offscreen_poll_id = self.after(30, self._poll_offscreen_frame)
+
+    def toggle_offscreen_render(self):
+        """Switch the time plot between the Tk canvas and the background renderer."""
+        if self.checkbox_offscreen.get() == 1:
+            if self.offscreen_renderer is None:
+                self.offscreen_renderer = OffscreenPlotRenderer(
+                    self.plot_manager.cutoff_lowpass, self.plot_manager.cutoff_highpass,
+                    setup_fn=self._apply_dark_theme
+                )
+            self._show_plot_widget(offscreen=True)
+            self.log_message("Rendering del grafico in background attivo.")
+        else:
+            if self.offscreen_poll_id is not None:
+                self.after_cancel(self.offscreen_poll_id)
+                self.offscreen_poll_id = None
+            if self.offscreen_renderer is not None:
+                self.offscreen_renderer.close()
+                self.offscreen_renderer = None
+            self.offscreen_render_start = None
+            self._show_plot_widget(offscreen=False)
+            self.log_message("Rendering del grafico in background disattivato.")
+        self.redraw_scheduler.invalidate()
+
+    def _show_plot_widget(self, offscreen):
+        """Show either the background-rendered image or the Tk canvas in the time plot slot."""
+        shown, hidden = (self.offscreen_canvas, self.canvas.get_tk_widget()) if offscreen \
+            else (self.canvas.get_tk_widget(), self.offscreen_canvas)
+        hidden.grid_remove()
+        shown.grid(row=0, column=0, sticky="nsew")
+
+    def get_plot_options(self):
+        """Return the plot selection checkboxes as a dict of flags."""
+        return {
             'x_orig': self.checkbox_plot_x_orig.get(),
             'y_orig': self.checkbox_plot_y_orig.get(),
             'z_orig': self.checkbox_plot_z_orig.get(),
@@ -412,21 +1023,68 @@ class CanInterfaceApp(ctk.CTk):
             'tetha_yz': self.checkbox_plot_tetha_yz.get(),
         }
 
-        # Delegate to PlotManager
-        self.plot_manager.process_and_plot(self.data_points, self.sampling_frequency, plot_options)
-        
-        self.update_plot_id = self.after(500, self.update_plot)
+    def parse_stats_windows(self):
+        """Parse the comma-separated statistics window lengths. Returns list of seconds or None if invalid."""
+        windows = []
+        for part in self.stats_windows_var.get().replace(' ', ',').split(','):
+            part = part.strip()
+            if not part:
+                continue
+            try:
+                length = float(part)
+            except ValueError:
+                self.log_message(f"Finestra statistiche non valida: '{part}'.")
+                return None
+            if length <= 0:
+                self.log_message("Le finestre statistiche devono essere maggiori di 0 s.")
+                return None
+            windows.append(length)
+        return windows or [1.0, 10.0]
+
+    def _stats_panel_text(self):
+        """Rolling statistics table, active alarms and the latest values of non-accelerometer nodes."""
+        lines = [self.rolling_stats.format_table()] if self.rolling_stats is not None else []
+        if self.alarm_engine is not None:
+            active = self.alarm_engine.active_alarms()
+            lines.append("Allarmi attivi: " + (', '.join(f"{can_id} {signal}" for can_id, signal in active) or "nessuno"))
+        for can_id, (timestamp, name, values) in sorted(self.node_signals.items()):
+            readings = ', '.join(f"{key}={value:.3f}" for key, value in values.items())
+            lines.append(f"{can_id} {name} @ {timestamp.strftime('%H:%M:%S')}: {readings}")
+        return '\n'.join(lines)
+
+    def _show_stats_text(self, text):
+        """Replace the content of the statistics table."""
+        self.stats_textbox.configure(state="normal")
+        self.stats_textbox.delete("1.0", "end")
+        self.stats_textbox.insert("end", text)
+        self.stats_textbox.configure(state="disabled")
+
+    def update_traffic_view(self):
+        """Show a snapshot of the reader thread's traffic counters; repeats while acquiring."""
+        self.traffic_update_id = None
+        monitor = self.can_controller.traffic_monitor
+        if monitor is not None:
+            self.traffic_textbox.configure(state="normal")
+            self.traffic_textbox.delete("1.0", "end")
+            self.traffic_textbox.insert("end", monitor.format_table())
+            self.traffic_textbox.configure(state="disabled")
+        if self.acquisition_active:
+            self.traffic_update_id = self.after(TRAFFIC_REFRESH_MS, self.update_traffic_view)
 
     def ensure_can_bus_initialized(self) -> bool:
         """Ensure CAN bus is initialized using current COM selection. Returns True on success."""
-        if self.can_controller.can_bus is not None:
+        if self.can_controller.is_bus_ready():
             return True
         selected_com = self.com_var.get()
         if selected_com == "Auto":
             ports = self.get_com_ports()
             if ports:
-                selected_com = ports[0]
-                self.log_message(f"Selezione automatica porta COM: {selected_com}")
+                selected_com = self.can_controller.find_slcan_port()
+                if selected_com is None:
+                    selected_com = ports[0]
+                    self.log_message(f"Nessun adattatore SLCAN ha risposto, uso {selected_com}")
+                else:
+                    self.log_message(f"Selezione automatica porta COM: {selected_com}")
             else:
                 self.log_message("Nessuna porta COM disponibile per slcan.")
                 return False
@@ -479,10 +1137,34 @@ class CanInterfaceApp(ctk.CTk):
 
         data_string = ''.join(bytes_list)
 
+        # Optional period for cyclic transmission
+        period_txt = self.custom_period_var.get().strip()
+        period_ms = None
+        if period_txt:
+            try:
+                period_ms = float(period_txt)
+            except ValueError:
+                self.log_message(f"Periodo non valido: '{period_txt}'.")
+                return
+            if period_ms <= 0:
+                self.log_message("Il periodo deve essere maggiore di 0 ms.")
+                return
+
         # Ensure bus
         if not self.ensure_can_bus_initialized():
             return
 
+        if period_ms is not None:
+            # Replace any running custom task with the new frame/period
+            self.stop_custom_periodic()
+            task = self.can_controller.send_periodic(addr_val, bytes.fromhex(data_string), period_ms / 1000)
+            if task is None:
+                self.log_message("Invio periodico CAN fallito.")
+                return
+            self.custom_periodic_task = task
+            self.custom_stop_btn.configure(state="normal")
+            return
+
         # Send
         success = self.can_controller.send_message('can0', addr_txt, data_string)
         if success:
@@ -490,38 +1172,52 @@ class CanInterfaceApp(ctk.CTk):
         else:
             self.log_message("Invio CAN fallito.")
 
-    def save_data_to_csv(self):
-        """Save collected data to CSV file."""
+    def stop_custom_periodic(self):
+        """Stop the cyclic transmission started from the custom message panel."""
+        if self.custom_periodic_task is None:
+            return
+        self.can_controller.stop_periodic(self.custom_periodic_task)
+        self.custom_periodic_task = None
+        self.custom_stop_btn.configure(state="disabled")
+        self.log_message("Invio periodico interrotto.")
+
+    def save_data_to_csv(self, blocks, zero_phase=False):
+        """
+        Save samples to CSV block by block, with the derived signals filtered per node.
+        Memory stays bounded by the block size whether the samples come from memory or disk.
+        Args:
+            blocks: iterable of (can_ids, time_us, x, y, z) blocks (see csv_export)
+            zero_phase: forward-backward filtering; rows are then grouped by CAN ID
+        """
         csv_filename = self.entry_csv_filename.get()
         if not csv_filename:
             self.log_message("CSV save skipped: no filename provided.")
             return
-
-        if not self.data_points:
-            self.log_message("No data to save.")
-            return
-
-        self.log_message(f"Saving {len(self.data_points)} data points to {csv_filename}...")
-        
-        # Compute filtered data using PlotManager
-        filtered = self.plot_manager.compute_filtered_data(self.data_points, self.sampling_frequency)
-
+        self.log_message(f"Saving {'zero-phase ' if zero_phase else ''}filtered data to {csv_filename}...")
+        rows = 0
         try:
             with open(csv_filename, 'w', newline='') as csvfile:
                 csv_writer = csv.writer(csvfile)
-                csv_writer.writerow([
-                    'Timestamp', 'CAN ID', 'x [g]', 'y [g]', 'z [g]',
-                    'x_incl [g]', 'y_incl [g]', 'z_incl [g]',
-                    'x_acc [g]', 'y_acc [g]', 'z_acc [g]',
-                    'Tetha_XZ [deg]', 'Tetha_YZ [deg]'
-                ])
-                for i, (ts, cid, xv, yv, zv) in enumerate(self.data_points):
-                    csv_writer.writerow([
-                        ts.strftime('%Y-%m-%d %H:%M:%S.%f'), cid, xv, yv, zv,
-                        filtered['x_incl'][i], filtered['y_incl'][i], filtered['z_incl'][i],
-                        filtered['x_acc'][i], filtered['y_acc'][i], filtered['z_acc'][i],
-                        filtered['tetha_xz'][i], filtered['tetha_yz'][i]
-                    ])
-            self.log_message(f"Data successfully saved to {csv_filename}")
+                csv_writer.writerow(CSV_HEADER)
+                for row in export_rows(
+                    blocks, self.sampling_frequency, self.plot_manager.cutoff_lowpass,
+                    self.plot_manager.cutoff_highpass, zero_phase=zero_phase
+                ):
+                    csv_writer.writerow(row)
+                    rows += 1
+                self._write_stats_rows(csv_writer)
+            if rows == 0:
+                self.log_message("No data to save.")
+            else:
+                self.log_message(f"{rows} data points saved to {csv_filename}{' (zero-phase filtering)' if zero_phase else ''}")
         except Exception as e:
             self.log_message(f"Error saving CSV: {e}")
+
+    def _write_stats_rows(self, csv_writer):
+        """Append the rolling statistics summary rows if requested."""
+        if self.checkbox_stats_csv.get() == 1 and self.rolling_stats is not None:
+            # Summary rows: rolling statistics at the end of the acquisition
+            csv_writer.writerow([])
+            csv_writer.writerow(['CAN ID', 'Signal', 'Window [s]', 'Samples'] + [name.capitalize() for name in STAT_NAMES])
+            for can_id, name, length, stats in self.rolling_stats.snapshot():
+                csv_writer.writerow([can_id, name, length, stats['count']] + [stats[s] for s in STAT_NAMES])
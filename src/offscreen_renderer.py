@@ -0,0 +1,107 @@
+import threading
+import time
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from plot_manager import PlotManager
+
+
+class OffscreenPlotRenderer:
+    """
+    Renders the time plot on a worker thread into an RGBA buffer.
+    The worker owns its own Agg figure and PlotManager, so matplotlib objects are never
+    shared with the Tk thread; the GUI only submits data snapshots and blits finished
+    frames. Requests are latest-wins: a new snapshot replaces one not yet started.
+    """
+
+    def __init__(self, cutoff_lowpass=1.0, cutoff_highpass=1.0, setup_fn=None, dpi=100):
+        """
+        Args:
+            cutoff_lowpass, cutoff_highpass: filter cutoffs for the worker's PlotManager
+            setup_fn: optional function(fig, ax) applying the theme, called on the worker thread
+            dpi: figure resolution used to convert pixel sizes to inches
+        """
+        self.cutoff_lowpass = cutoff_lowpass
+        self.cutoff_highpass = cutoff_highpass
+        self.setup_fn = setup_fn
+        self.dpi = dpi
+        self.last_render_s = 0.0
+        self._cond = threading.Condition()
+        self._request = None
+        self._result = None
+        self._error = None
+        self._rendering = False
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self):
+        """True while a request is queued or being rendered."""
+        with self._cond:
+            return self._request is not None or self._rendering
+
+    def request(self, data_points, sampling_frequency, plot_options, data_version, size_px):
+        """
+        Queue a frame. Called on the Tk thread; only a shallow copy of the sample list is made here.
+        Args:
+            size_px: (width, height) of the target widget in pixels
+        """
+        snapshot = list(data_points)
+        with self._cond:
+            self._request = (snapshot, sampling_frequency, dict(plot_options), data_version, size_px)
+            self._cond.notify()
+
+    def take_result(self):
+        """Return the newest finished frame as (rgba_bytes, width, height), or None."""
+        with self._cond:
+            result, self._result = self._result, None
+            return result
+
+    def take_error(self):
+        """Return the message of the last failed render (once), or None."""
+        with self._cond:
+            error, self._error = self._error, None
+            return error
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+
+    def _run(self):
+        fig = Figure(dpi=self.dpi)
+        canvas = FigureCanvasAgg(fig)
+        ax = fig.add_subplot(111)
+        ax.grid(True)
+        if self.setup_fn is not None:
+            self.setup_fn(fig, ax)
+        plot_manager = PlotManager(ax, canvas, self.cutoff_lowpass, self.cutoff_highpass)
+        while True:
+            with self._cond:
+                while self._request is None and not self._closed:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                request, self._request = self._request, None
+                self._rendering = True
+            error = None
+            start = time.perf_counter()
+            try:
+                data_points, fs, plot_options, data_version, (width, height) = request
+                width, height = max(width, 50), max(height, 50)
+                if (width, height) != canvas.get_width_height():
+                    fig.set_size_inches(width / self.dpi, height / self.dpi)
+                plot_manager.process_and_plot(data_points, fs, plot_options, data_version=data_version)
+                w, h = canvas.get_width_height()
+                result = (bytes(canvas.buffer_rgba()), w, h)
+            except Exception as e:
+                result = None
+                error = f"{type(e).__name__}: {e}"
+            self.last_render_s = time.perf_counter() - start
+            with self._cond:
+                self._rendering = False
+                if result is not None:
+                    self._result = result
+                else:
+                    self._error = error
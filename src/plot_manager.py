@@ -1,6 +1,20 @@
-import numpy as np
 import matplotlib.dates as mdates
-from utils import butter_lowpass_filter, butter_highpass_filter
+from signal_graph import DERIVED_SIGNALS, build_default_graph
+
+# (plot option key, signal name, legend label, linestyle)
+PLOT_SERIES = (
+    ('x_orig', 'x', 'x (Orig)', '-'),
+    ('y_orig', 'y', 'y (Orig)', '-'),
+    ('z_orig', 'z', 'z (Orig)', '-'),
+    ('x_incl', 'x_incl', 'x_incl', '--'),
+    ('y_incl', 'y_incl', 'y_incl', '--'),
+    ('z_incl', 'z_incl', 'z_incl', '--'),
+    ('x_acc', 'x_acc', 'x_acc', ':'),
+    ('y_acc', 'y_acc', 'y_acc', ':'),
+    ('z_acc', 'z_acc', 'z_acc', ':'),
+    ('tetha_xz', 'tetha_xz', 'Tetha_XZ [deg]', '-.'),
+    ('tetha_yz', 'tetha_yz', 'Tetha_YZ [deg]', '-.'),
+)
 
 
 class PlotManager:
@@ -21,18 +35,45 @@ class PlotManager:
         self.canvas = canvas
         self.cutoff_lowpass = cutoff_lowpass
         self.cutoff_highpass = cutoff_highpass
+        self.signal_graph = build_default_graph()
         
     def clear_plot(self, title='Sensor Data in Real Time', xlabel='Time', ylabel='Value'):
         """Clear the plot and set default labels."""
+        self.signal_graph.invalidate()
         self.ax.clear()
         self.ax.set_title(title, color='white')
         self.ax.set_xlabel(xlabel, color='white')
         self.ax.set_ylabel(ylabel, color='white')
         self.canvas.draw()
     
-    def process_and_plot(self, data_points, sampling_frequency, plot_options):
+    def evaluate_signals(self, names, data_points, sampling_frequency, data_version=None):
+        """
+        Compute only the requested signals (and their dependencies) through the signal graph.
+        Results are memoized until data_version, sampling frequency or cutoffs change.
+
+        Args:
+            names: iterable of signal names (raw 'time', 'x', 'y', 'z' or derived)
+            data_points: list of tuples (timestamp, can_id, x, y, z)
+            sampling_frequency: sampling frequency in Hz
+            data_version: counter bumped when data_points changes; defaults to (id, len)
+        Returns:
+            dict name -> array
+        """
+        if data_version is None:
+            data_version = (id(data_points), len(data_points))
+        version = (data_version, sampling_frequency, self.cutoff_lowpass, self.cutoff_highpass)
+        inputs = {
+            'data_points': data_points,
+            'fs': sampling_frequency,
+            'cutoff_lowpass': self.cutoff_lowpass,
+            'cutoff_highpass': self.cutoff_highpass,
+        }
+        return self.signal_graph.evaluate(names, inputs, version)
+
+    def process_and_plot(self, data_points, sampling_frequency, plot_options, data_version=None):
         """
         Process data with filters and plot selected signals.
+        Only the signals needed by the selected options are computed.
         
         Args:
             data_points: list of tuples (timestamp, can_id, x, y, z)
@@ -44,57 +85,25 @@ class PlotManager:
                     'x_acc', 'y_acc', 'z_acc',
                     'tetha_xz', 'tetha_yz'
                 }
+            data_version: optional counter bumped by the caller whenever data_points changes
         """
         if len(data_points) < 2:
             return
         
         self.ax.clear()
-        
-        # Extract raw data
-        time_data = [dp[0] for dp in data_points]
-        x_data_orig = np.array([dp[2] for dp in data_points])
-        y_data_orig = np.array([dp[3] for dp in data_points])
-        z_data_orig = np.array([dp[4] for dp in data_points])
-        
-        # Apply filters and calculate derived signals
-        if sampling_frequency > 0:
-            x_incl = butter_lowpass_filter(x_data_orig, self.cutoff_lowpass, sampling_frequency)
-            y_incl = butter_lowpass_filter(y_data_orig, self.cutoff_lowpass, sampling_frequency)
-            z_incl = butter_lowpass_filter(z_data_orig, self.cutoff_lowpass, sampling_frequency)
-            x_acc = butter_highpass_filter(x_data_orig, self.cutoff_highpass, sampling_frequency)
-            y_acc = butter_highpass_filter(y_data_orig, self.cutoff_highpass, sampling_frequency)
-            z_acc = butter_highpass_filter(z_data_orig, self.cutoff_highpass, sampling_frequency)
-            tetha_xz = np.degrees(np.arctan2(x_incl, z_incl))
-            tetha_yz = np.degrees(np.arctan2(y_incl, z_incl))
-        else:
-            x_incl, y_incl, z_incl, x_acc, y_acc, z_acc, tetha_xz, tetha_yz = (np.array([]),) * 8
-        
-        # Plot selected signals
-        if plot_options.get('x_orig'):
-            self.ax.plot(time_data, x_data_orig, label='x (Orig)')
-        if plot_options.get('y_orig'):
-            self.ax.plot(time_data, y_data_orig, label='y (Orig)')
-        if plot_options.get('z_orig'):
-            self.ax.plot(time_data, z_data_orig, label='z (Orig)')
-        
-        if plot_options.get('x_incl'):
-            self.ax.plot(time_data, x_incl, label='x_incl', linestyle='--')
-        if plot_options.get('y_incl'):
-            self.ax.plot(time_data, y_incl, label='y_incl', linestyle='--')
-        if plot_options.get('z_incl'):
-            self.ax.plot(time_data, z_incl, label='z_incl', linestyle='--')
-        
-        if plot_options.get('x_acc'):
-            self.ax.plot(time_data, x_acc, label='x_acc', linestyle=':')
-        if plot_options.get('y_acc'):
-            self.ax.plot(time_data, y_acc, label='y_acc', linestyle=':')
-        if plot_options.get('z_acc'):
-            self.ax.plot(time_data, z_acc, label='z_acc', linestyle=':')
-        
-        if plot_options.get('tetha_xz'):
-            self.ax.plot(time_data, tetha_xz, label='Tetha_XZ [deg]', linestyle='-.')
-        if plot_options.get('tetha_yz'):
-            self.ax.plot(time_data, tetha_yz, label='Tetha_YZ [deg]', linestyle='-.')
+
+        # Derived signals need a valid sampling frequency
+        selected = [
+            series for series in PLOT_SERIES
+            if plot_options.get(series[0]) and (sampling_frequency > 0 or series[1] not in DERIVED_SIGNALS)
+        ]
+        signals = self.evaluate_signals(
+            ['time'] + [series[1] for series in selected], data_points, sampling_frequency, data_version
+        )
+
+        time_data = signals['time']
+        for _, name, label, linestyle in selected:
+            self.ax.plot(time_data, signals[name], label=label, linestyle=linestyle)
         
         # Apply styling
         self._apply_plot_styling()
@@ -102,6 +111,28 @@ class PlotManager:
         # Draw the updated plot
         self.canvas.draw()
     
+    def plot_recording(self, reader, plot_options, t_start=None, t_end=None, can_id=None, sampling_frequency=None):
+        """
+        Plot a time range of a chunk-store recording, reading only the chunks that cover it.
+
+        Args:
+            reader: ChunkStoreReader
+            plot_options: dict with boolean flags for each plot type (see process_and_plot)
+            t_start, t_end: optional datetime bounds
+            can_id: optional CAN ID string to show a single node
+            sampling_frequency: Hz; defaults to the value stored with the first selected chunk
+        Returns:
+            number of samples plotted
+        """
+        if sampling_frequency is None:
+            sampling_frequency = reader.metadata_for(t_start, t_end, can_id).get('sampling_frequency', 0)
+        data_points = reader.load_points(t_start, t_end, can_id)
+        if len(data_points) < 2:
+            return len(data_points)
+        version = ('recording', reader.directory, len(reader.index), t_start, t_end, can_id)
+        self.process_and_plot(data_points, sampling_frequency, plot_options, data_version=version)
+        return len(data_points)
+
     def _apply_plot_styling(self):
         """Apply consistent styling to the plot (dark theme)."""
         self.ax.legend(
@@ -120,42 +151,66 @@ class PlotManager:
         self.ax.figure.autofmt_xdate()
         self.ax.figure.tight_layout(rect=[0, 0, 0.8, 1])
     
-    def compute_filtered_data(self, data_points, sampling_frequency):
+    def compute_filtered_data(self, data_points, sampling_frequency, signals=DERIVED_SIGNALS, data_version=None):
         """
-        Compute all filtered signals for CSV export.
+        Compute filtered signals for CSV export.
         
+        Args:
+            signals: names of the derived signals to compute (default: all)
+            data_version: optional counter bumped by the caller whenever data_points changes
         Returns:
             dict with keys: x_incl, y_incl, z_incl, x_acc, y_acc, z_acc, tetha_xz, tetha_yz
         """
         if not data_points:
             return {}
         
-        x_data_orig = np.array([dp[2] for dp in data_points])
-        y_data_orig = np.array([dp[3] for dp in data_points])
-        z_data_orig = np.array([dp[4] for dp in data_points])
-        
         if sampling_frequency > 0:
-            x_incl = butter_lowpass_filter(x_data_orig, self.cutoff_lowpass, sampling_frequency)
-            y_incl = butter_lowpass_filter(y_data_orig, self.cutoff_lowpass, sampling_frequency)
-            z_incl = butter_lowpass_filter(z_data_orig, self.cutoff_lowpass, sampling_frequency)
-            x_acc = butter_highpass_filter(x_data_orig, self.cutoff_highpass, sampling_frequency)
-            y_acc = butter_highpass_filter(y_data_orig, self.cutoff_highpass, sampling_frequency)
-            z_acc = butter_highpass_filter(z_data_orig, self.cutoff_highpass, sampling_frequency)
-            tetha_xz = np.degrees(np.arctan2(x_incl, z_incl))
-            tetha_yz = np.degrees(np.arctan2(y_incl, z_incl))
+            return self.evaluate_signals(signals, data_points, sampling_frequency, data_version)
+
+        n = len(data_points)
+        return {name: [None] * n for name in signals}
+
+
+class RedrawScheduler:
+    """
+    Dirty tracking and adaptive refresh interval for the plot loop.
+    A tick renders only when the (data version, plot options) key changed since the last
+    render. Render time is measured and the interval is adjusted so that rendering uses
+    about `target_load` of the main thread, within [min_interval_ms, max_interval_ms].
+    """
+
+    def __init__(self, target_load=0.25, min_interval_ms=100, max_interval_ms=2000, initial_interval_ms=500, smoothing=0.3):
+        """
+        Args:
+            target_load: fraction of wall time the redraw may take (0-1)
+            min_interval_ms, max_interval_ms: bounds of the refresh interval
+            initial_interval_ms: interval used before any render was measured
+            smoothing: weight of the newest measurement in the moving averages (0-1)
+        """
+        self.target_load = target_load
+        self.min_interval_ms = min_interval_ms
+        self.max_interval_ms = max_interval_ms
+        self.smoothing = smoothing
+        self.interval_ms = initial_interval_ms
+        self.avg_render_ms = None
+        self._rendered_key = None
+
+    def invalidate(self):
+        """Force the next tick to render."""
+        self._rendered_key = None
+
+    def needs_render(self, key):
+        return key != self._rendered_key
+
+    def record_render(self, key, duration_s):
+        """Store the rendered key and adapt the interval to the measured render time."""
+        self._rendered_key = key
+        render_ms = duration_s * 1000
+        if self.avg_render_ms is None:
+            self.avg_render_ms = render_ms
         else:
-            n = len(data_points)
-            x_incl, y_incl, z_incl = [None] * n, [None] * n, [None] * n
-            x_acc, y_acc, z_acc = [None] * n, [None] * n, [None] * n
-            tetha_xz, tetha_yz = [None] * n, [None] * n
-        
-        return {
-            'x_incl': x_incl,
-            'y_incl': y_incl,
-            'z_incl': z_incl,
-            'x_acc': x_acc,
-            'y_acc': y_acc,
-            'z_acc': z_acc,
-            'tetha_xz': tetha_xz,
-            'tetha_yz': tetha_yz,
-        }
+            self.avg_render_ms += self.smoothing * (render_ms - self.avg_render_ms)
+        desired = self.avg_render_ms / self.target_load
+        # Move gradually toward the desired interval so the refresh rate stays smooth
+        interval = self.interval_ms + self.smoothing * (desired - self.interval_ms)
+        self.interval_ms = int(min(self.max_interval_ms, max(self.min_interval_ms, interval)))
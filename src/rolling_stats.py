@@ -0,0 +1,154 @@
+import math
+from collections import deque
+
+import numpy as np
+
+# Statistics reported for every (node, signal, window) triple, in display/export order
+STAT_NAMES = ('mean', 'rms', 'std', 'min', 'max', 'peak')
+
+
+class RollingWindow:
+    """
+    Time-based sliding window updated one chunk at a time.
+    Samples are kept as the chunk arrays they arrived in, each with its min/max; running
+    sums give mean, RMS and standard deviation. A push costs a few vectorized reductions
+    over the new chunk and the evicted samples, never a rescan of the whole window.
+    """
+
+    def __init__(self, length):
+        """
+        Args:
+            length: window length in seconds
+        """
+        self.length = length
+        self.reset()
+
+    def reset(self):
+        # deque of [times, values, min, max] blocks, oldest first
+        self._blocks = deque()
+        self._count = 0
+        self._sum = 0.0
+        self._sumsq = 0.0
+
+    def push(self, times, values):
+        """Add a chunk of time-ordered samples (times in seconds) and drop samples older than the window."""
+        times = np.asarray(times, dtype=float)
+        values = np.asarray(values, dtype=float)
+        if times.size == 0:
+            return
+        self._blocks.append([times, values, float(values.min()), float(values.max())])
+        self._count += values.size
+        self._sum += float(values.sum())
+        self._sumsq += float(np.dot(values, values))
+
+        cutoff = times[-1] - self.length
+        while self._blocks:
+            block_times, block_values = self._blocks[0][:2]
+            drop = int(np.searchsorted(block_times, cutoff, side='right'))
+            if drop == 0:
+                break
+            old = block_values[:drop]
+            self._count -= drop
+            self._sum -= float(old.sum())
+            self._sumsq -= float(np.dot(old, old))
+            if drop == block_times.size:
+                self._blocks.popleft()
+                continue
+            kept = block_values[drop:]
+            self._blocks[0] = [block_times[drop:], kept, float(kept.min()), float(kept.max())]
+            break
+
+    def stats(self):
+        """Return dict with count and STAT_NAMES values, or None if the window is empty."""
+        n = self._count
+        if n == 0:
+            return None
+        mean = self._sum / n
+        mean_sq = max(self._sumsq / n, 0.0)
+        lo = min(block[2] for block in self._blocks)
+        hi = max(block[3] for block in self._blocks)
+        return {
+            'count': n,
+            'mean': mean,
+            'rms': math.sqrt(mean_sq),
+            # Clamp tiny negative values caused by floating point cancellation
+            'std': math.sqrt(max(mean_sq - mean * mean, 0.0)),
+            'min': lo,
+            'max': hi,
+            'peak': max(abs(lo), abs(hi)),
+        }
+
+
+class RollingStats:
+    """
+    Rolling statistics for several signals of every node, each over several window lengths.
+    Chunks interleave the samples of all CAN IDs; they are split by node so each window
+    only ever sees one node's samples.
+    """
+
+    def __init__(self, signals, windows=(1.0, 10.0)):
+        """
+        Args:
+            signals: names of the signals to track (keys of the streaming chunk dict)
+            windows: window lengths in seconds
+        """
+        self.signals = tuple(signals)
+        self.windows = tuple(sorted(windows))
+        # (can_id, signal, window length) -> RollingWindow, created when a node is first seen
+        self._windows = {}
+        self._nodes = []
+
+    def reset(self):
+        self._windows = {}
+        self._nodes = []
+
+    def _add_node(self, can_id):
+        self._nodes.append(can_id)
+        for name in self.signals:
+            for length in self.windows:
+                self._windows[(can_id, name, length)] = RollingWindow(length)
+
+    def push_chunk(self, times, chunk, can_ids):
+        """
+        Feed one ingest chunk.
+        Args:
+            times: sample times in seconds (sequence aligned with the chunk arrays)
+            chunk: dict signal name -> array of values
+            can_ids: CAN ID of each sample
+        """
+        if not len(can_ids):
+            return
+        times = np.asarray(times, dtype=float)
+        unique_ids, inverse = np.unique(np.asarray(can_ids), return_inverse=True)
+        order = np.argsort(inverse, kind='stable')
+        groups = np.split(order, np.cumsum(np.bincount(inverse))[:-1])
+        for can_id, idx in zip(unique_ids.tolist(), groups):
+            if can_id not in self._nodes:
+                self._add_node(can_id)
+            node_times = times[idx]
+            for name in self.signals:
+                values = chunk.get(name)
+                if values is None:
+                    continue
+                node_values = np.asarray(values, dtype=float)[idx]
+                for length in self.windows:
+                    self._windows[(can_id, name, length)].push(node_times, node_values)
+
+    def snapshot(self):
+        """Return list of (can_id, signal, window_length, stats_dict) for windows with data."""
+        rows = []
+        for can_id in sorted(self._nodes):
+            for name in self.signals:
+                for length in self.windows:
+                    stats = self._windows[(can_id, name, length)].stats()
+                    if stats is not None:
+                        rows.append((can_id, name, length, stats))
+        return rows
+
+    def format_table(self):
+        """Format the current snapshot as fixed-width text for the GUI."""
+        header = f"{'CAN ID':<8}{'Signal':<10}{'Win[s]':>7}" + ''.join(f"{s:>10}" for s in STAT_NAMES)
+        lines = [header]
+        for can_id, name, length, stats in self.snapshot():
+            lines.append(f"{can_id:<8}{name:<10}{length:>7g}" + ''.join(f"{stats[s]:>10.4f}" for s in STAT_NAMES))
+        return '\n'.join(lines)
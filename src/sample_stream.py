@@ -0,0 +1,243 @@
+import os
+import socket
+import stat
+import struct
+import threading
+from collections import deque
+
+import numpy as np
+
+# Frame: header (magic, version, sample count) followed by packed sample records
+FRAME_MAGIC = b'RUMS'
+FRAME_VERSION = 1
+_FRAME_HEADER = struct.Struct('<4sHI')
+SAMPLE_DTYPE = np.dtype([('time', '<f8'), ('can_id', '<u4'), ('x', '<f4'), ('y', '<f4'), ('z', '<f4')])
+DROP_POLICIES = ('oldest', 'newest')
+
+
+def parse_address(text):
+    """
+    Parse 'host:port' (TCP) or a filesystem path (Unix socket).
+    Returns: (family, address)
+    """
+    text = text.strip()
+    host, sep, port = text.rpartition(':')
+    if sep and port.isdigit():
+        return socket.AF_INET, (host or '127.0.0.1', int(port))
+    if not hasattr(socket, 'AF_UNIX'):
+        raise ValueError(f"Invalid address '{text}', expected host:port.")
+    return socket.AF_UNIX, text
+
+
+def encode_frame(points):
+    """
+    Pack a chunk of decoded samples into one binary frame.
+    Args:
+        points: list of (timestamp, can_id, x, y, z) with datetime timestamps and hex string CAN IDs
+    """
+    records = np.empty(len(points), dtype=SAMPLE_DTYPE)
+    records['time'] = [p[0].timestamp() for p in points]
+    records['can_id'] = [int(p[1], 16) if isinstance(p[1], str) else p[1] for p in points]
+    records['x'] = [p[2] for p in points]
+    records['y'] = [p[3] for p in points]
+    records['z'] = [p[4] for p in points]
+    return _FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, len(points)) + records.tobytes()
+
+
+def _recv_exact(sock, size):
+    buf = bytearray()
+    while len(buf) < size:
+        part = sock.recv(size - len(buf))
+        if not part:
+            return None
+        buf.extend(part)
+    return bytes(buf)
+
+
+def read_frames(sock):
+    """
+    Yield decoded frames from a connected socket as structured arrays (SAMPLE_DTYPE)
+    until the publisher closes the connection.
+    """
+    while True:
+        header = _recv_exact(sock, _FRAME_HEADER.size)
+        if header is None:
+            return
+        magic, version, count = _FRAME_HEADER.unpack(header)
+        if magic != FRAME_MAGIC or version != FRAME_VERSION:
+            raise ValueError(f"Unexpected frame header {magic!r} v{version}.")
+        payload = _recv_exact(sock, count * SAMPLE_DTYPE.itemsize)
+        if payload is None:
+            return
+        yield np.frombuffer(payload, dtype=SAMPLE_DTYPE, count=count)
+
+
+def connect(address):
+    """Open a subscriber connection to 'host:port' or a Unix socket path."""
+    family, addr = parse_address(address)
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.connect(addr)
+    return sock
+
+
+class _Subscriber:
+    """One connected client with its own bounded frame queue and sender thread."""
+
+    def __init__(self, conn, peer, max_frames, drop_policy, on_close):
+        self.conn = conn
+        self.peer = peer
+        self.drop_policy = drop_policy
+        self.dropped = 0
+        self._frames = deque()
+        self._max_frames = max_frames
+        self._cond = threading.Condition()
+        self._closed = False
+        self._on_close = on_close
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def enqueue(self, frame):
+        """Queue a frame without blocking; applies the drop policy when the queue is full."""
+        with self._cond:
+            if self._closed:
+                return
+            if len(self._frames) >= self._max_frames:
+                self.dropped += 1
+                if self.drop_policy == 'newest':
+                    return
+                self._frames.popleft()
+            self._frames.append(frame)
+            self._cond.notify()
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        try:
+            # Unblocks a sendall() stuck on a stalled consumer
+            self.conn.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def _run(self):
+        try:
+            while True:
+                with self._cond:
+                    while not self._frames and not self._closed:
+                        self._cond.wait()
+                    if self._closed:
+                        return
+                    frame = self._frames.popleft()
+                self.conn.sendall(frame)
+        except OSError:
+            pass
+        finally:
+            try:
+                self.conn.close()
+            except OSError:
+                pass
+            self._on_close(self)
+
+
+class SampleStreamServer:
+    """
+    Publishes decoded sample chunks to any number of local subscribers.
+    publish() only encodes the chunk once and appends it to each subscriber's bounded
+    queue; sockets are written by per-subscriber threads, so a slow or stalled consumer
+    loses frames (counted in dropped) instead of blocking acquisition.
+    """
+
+    def __init__(self, address='127.0.0.1:5555', max_frames=100, drop_policy='oldest', log_callback=None):
+        """
+        Args:
+            address: 'host:port' for TCP or a filesystem path for a Unix socket
+            max_frames: frames buffered per subscriber before dropping
+            drop_policy: 'oldest' discards the oldest queued frame, 'newest' discards the incoming one
+            log_callback: optional function(message)
+        """
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy '{drop_policy}'.")
+        self.address = address
+        self.max_frames = max(1, int(max_frames))
+        self.drop_policy = drop_policy
+        self.log_callback = log_callback or print
+        self._family, self._addr = parse_address(address)
+        self._subscribers = []
+        self._lock = threading.Lock()
+        self._server = None
+        self._accept_thread = None
+
+    def start(self):
+        """Bind and start accepting subscribers. Returns True on success."""
+        try:
+            server = socket.socket(self._family, socket.SOCK_STREAM)
+            if self._family == socket.AF_INET:
+                server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            elif os.path.exists(self._addr) and stat.S_ISSOCK(os.stat(self._addr).st_mode):
+                os.unlink(self._addr)  # stale socket left by a previous run
+            server.bind(self._addr)
+            server.listen()
+        except OSError as e:
+            self.log_callback(f"Error starting sample stream on {self.address}: {e}")
+            return False
+        self._server = server
+        self._accept_thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._accept_thread.start()
+        self.log_callback(f"Stream campioni in ascolto su {self.address}")
+        return True
+
+    @property
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+    def _accept_loop(self):
+        server = self._server
+        while True:
+            try:
+                conn, peer = server.accept()
+            except OSError:
+                return
+            conn.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+            peer = peer or self.address
+            subscriber = _Subscriber(conn, peer, self.max_frames, self.drop_policy, self._remove)
+            with self._lock:
+                self._subscribers.append(subscriber)
+            self.log_callback(f"Sottoscrittore connesso: {peer}")
+
+    def _remove(self, subscriber):
+        with self._lock:
+            if subscriber not in self._subscribers:
+                return
+            self._subscribers.remove(subscriber)
+        self.log_callback(f"Sottoscrittore disconnesso: {subscriber.peer} ({subscriber.dropped} frame scartati)")
+
+    def publish(self, points):
+        """Send a chunk of (timestamp, can_id, x, y, z) samples to all subscribers."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        if not subscribers or not points:
+            return
+        frame = encode_frame(points)
+        for subscriber in subscribers:
+            subscriber.enqueue(frame)
+
+    def close(self):
+        """Stop accepting, disconnect all subscribers and remove a Unix socket file."""
+        if self._server is not None:
+            try:
+                # shutdown() wakes the accept() call blocked in the accept thread
+                self._server.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._server.close()
+            self._server = None
+            if self._family != socket.AF_INET:
+                try:
+                    os.unlink(self._addr)
+                except OSError:
+                    pass
+        with self._lock:
+            subscribers, self._subscribers = self._subscribers, []
+        for subscriber in subscribers:
+            subscriber.close()
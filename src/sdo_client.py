@@ -0,0 +1,241 @@
+import struct
+import threading
+import time
+
+# CANopen default COB-IDs: client -> server requests and server -> client responses
+SDO_RX_BASE = 0x600
+SDO_TX_BASE = 0x580
+
+# Command specifiers (CiA 301)
+_CS_DOWNLOAD_ACK = 0x60
+_CS_UPLOAD_REQUEST = 0x40
+_CS_UPLOAD_RESPONSE = 0x40
+_CS_ABORT = 0x80
+
+_SDO_FRAME = struct.Struct('<BHB4s')
+
+ABORT_CODES = {
+    0x05040000: "SDO protocol timed out",
+    0x05040001: "Command specifier not valid",
+    0x06010000: "Unsupported access to an object",
+    0x06010001: "Attempt to read a write only object",
+    0x06010002: "Attempt to write a read only object",
+    0x06020000: "Object does not exist",
+    0x06070010: "Data type does not match",
+    0x06090011: "Sub-index does not exist",
+    0x06090030: "Value range of parameter exceeded",
+    0x08000000: "General error",
+    0x08000020: "Data cannot be transferred or stored",
+}
+
+
+def encode_download(index, subindex, value, size):
+    """
+    Build an expedited SDO download (write) request.
+    Args:
+        value: integer value (negative values are written in two's complement)
+        size: object size in bytes (1-4)
+    Returns: 8 data bytes
+    """
+    if not 1 <= size <= 4:
+        raise ValueError("Expedited SDO size must be 1-4 bytes.")
+    command = 0x23 | ((4 - size) << 2)
+    payload = value.to_bytes(size, 'little', signed=value < 0).ljust(4, b'\x00')
+    return _SDO_FRAME.pack(command, index, subindex, payload)
+
+
+def encode_upload(index, subindex):
+    """Build an SDO upload (read) request. Returns: 8 data bytes."""
+    return _SDO_FRAME.pack(_CS_UPLOAD_REQUEST, index, subindex, b'\x00' * 4)
+
+
+def decode_response(data):
+    """
+    Decode an SDO server response.
+    Returns: (kind, index, subindex, value) where kind is 'download', 'upload', 'abort'
+    or 'unsupported'; value is the uploaded bytes, the abort code or None.
+    """
+    if len(data) < 8:
+        return 'unsupported', None, None, None
+    command, index, subindex, payload = _SDO_FRAME.unpack_from(bytes(data))
+    if command == _CS_DOWNLOAD_ACK:
+        return 'download', index, subindex, None
+    if command == _CS_ABORT:
+        return 'abort', index, subindex, int.from_bytes(payload, 'little')
+    if command & 0xE0 == _CS_UPLOAD_RESPONSE and command & 0x02:
+        # Expedited upload: size indicated when bit s is set, otherwise 4 bytes
+        size = 4 - ((command >> 2) & 0x03) if command & 0x01 else 4
+        return 'upload', index, subindex, payload[:size]
+    return 'unsupported', index, subindex, None
+
+
+class SdoClient:
+    """
+    CANopen SDO client (expedited transfers) on top of CanController.
+    Responses are matched by node ID and index/subindex with timeouts and retries.
+    Transfers to different nodes are pipelined: all requests of a round are sent as
+    one batch and the responses are collected together.
+    """
+
+    def __init__(self, can_controller, timeout=0.2, retries=2, log_callback=None):
+        """
+        Args:
+            can_controller: CanController with an initialized bus
+            timeout: seconds to wait for the responses of one round
+            retries: extra attempts for nodes that did not answer
+            log_callback: optional function(message); defaults to the controller's logger
+        """
+        self.can_controller = can_controller
+        self.timeout = timeout
+        self.retries = retries
+        self.log_callback = log_callback or can_controller.log_callback
+        self._cond = threading.Condition()
+        self._expected = {}
+        self._responses = {}
+        can_controller.add_frame_listener(self._on_frame)
+
+    def _on_frame(self, timestamp, arbitration_id, data):
+        """Store SDO responses for transfers in progress (called from the reader thread)."""
+        node_id = arbitration_id - SDO_TX_BASE
+        if not 1 <= node_id <= 0x7F or len(data) < 8:
+            return
+        with self._cond:
+            mux = self._expected.get(node_id)
+            if mux is None:
+                return
+            kind, index, subindex, value = decode_response(data)
+            if (index, subindex) != mux:
+                return
+            self._responses[node_id] = (kind, value)
+            self._cond.notify_all()
+
+    def _wait_responses(self, node_ids, deadline):
+        """Wait until every node in node_ids has answered or the deadline expires."""
+        while True:
+            with self._cond:
+                if all(n in self._responses for n in node_ids):
+                    return
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                if self.can_controller.reading_active:
+                    self._cond.wait(remaining)
+                    continue
+            # No reader thread running: pump the bus ourselves
+            for frame in self.can_controller.recv_frames(timeout=remaining):
+                self._on_frame(*frame)
+
+    def _transfer_round(self, requests):
+        """
+        Run one pipelined round with at most one request per node.
+        Args:
+            requests: dict node_id -> (index, subindex, request_bytes)
+        Returns: dict node_id -> (kind, value), or None for nodes that never answered
+        """
+        results = {}
+        pending = dict(requests)
+        for attempt in range(self.retries + 1):
+            if not pending:
+                break
+            with self._cond:
+                for node_id, (index, subindex, _) in pending.items():
+                    self._expected[node_id] = (index, subindex)
+                    self._responses.pop(node_id, None)
+            frames = [(SDO_RX_BASE + node_id, req) for node_id, (_, _, req) in pending.items()]
+            self.can_controller.send_frames(frames)
+            self._wait_responses(list(pending), time.monotonic() + self.timeout)
+            with self._cond:
+                for node_id in list(pending):
+                    if node_id in self._responses:
+                        results[node_id] = self._responses.pop(node_id)
+                        del pending[node_id]
+                        del self._expected[node_id]
+        with self._cond:
+            for node_id in pending:
+                self._expected.pop(node_id, None)
+                results[node_id] = None
+        return results
+
+    def _run(self, transfers):
+        """
+        Execute transfers [(node_id, index, subindex, request_bytes), ...] in rounds so that
+        each node has a single outstanding request while different nodes run in parallel.
+        Returns: list of (kind, value) or None, in input order
+        """
+        queues = {}
+        for pos, (node_id, index, subindex, req) in enumerate(transfers):
+            queues.setdefault(node_id, []).append((pos, index, subindex, req))
+        results = [None] * len(transfers)
+        while queues:
+            round_positions = {}
+            requests = {}
+            for node_id, queue in list(queues.items()):
+                pos, index, subindex, req = queue.pop(0)
+                round_positions[node_id] = pos
+                requests[node_id] = (index, subindex, req)
+                if not queue:
+                    del queues[node_id]
+            for node_id, response in self._transfer_round(requests).items():
+                results[round_positions[node_id]] = response
+        return results
+
+    def _check(self, node_id, index, subindex, response, expected_kind):
+        """Log failures for one transfer and return True if the response is the expected one."""
+        if response is None:
+            self.log_callback(f"SDO timeout: node {node_id:02X} {index:04X}sub{subindex:X}")
+            return False
+        kind, value = response
+        if kind == 'abort':
+            reason = ABORT_CODES.get(value, "unknown")
+            self.log_callback(f"SDO abort: node {node_id:02X} {index:04X}sub{subindex:X} code {value:08X} ({reason})")
+            return False
+        if kind != expected_kind:
+            self.log_callback(f"SDO unexpected response ({kind}): node {node_id:02X} {index:04X}sub{subindex:X}")
+            return False
+        return True
+
+    def write_many(self, writes):
+        """
+        Pipelined expedited downloads.
+        Args:
+            writes: iterable of (node_id, index, subindex, value, size)
+        Returns: list of bools (True when the node acknowledged), in input order
+        """
+        writes = list(writes)
+        try:
+            transfers = [(n, i, s, encode_download(i, s, v, size)) for n, i, s, v, size in writes]
+        except (ValueError, OverflowError) as e:
+            self.log_callback(f"Invalid SDO write: {e}")
+            return [False] * len(writes)
+        responses = self._run(transfers)
+        return [self._check(n, i, s, r, 'download') for (n, i, s, _, _), r in zip(writes, responses)]
+
+    def read_many(self, reads, signed=False):
+        """
+        Pipelined expedited uploads.
+        Args:
+            reads: iterable of (node_id, index, subindex)
+            signed: decode values as two's complement integers
+        Returns: list of integer values (None on failure), in input order
+        """
+        reads = list(reads)
+        responses = self._run([(n, i, s, encode_upload(i, s)) for n, i, s in reads])
+        values = []
+        for (n, i, s), r in zip(reads, responses):
+            if self._check(n, i, s, r, 'upload'):
+                values.append(int.from_bytes(r[1], 'little', signed=signed))
+            else:
+                values.append(None)
+        return values
+
+    def write(self, node_id, index, subindex, value, size):
+        """Expedited download to one node. Returns: True if acknowledged."""
+        return self.write_many([(node_id, index, subindex, value, size)])[0]
+
+    def read(self, node_id, index, subindex, signed=False):
+        """Expedited upload from one node. Returns: integer value or None."""
+        return self.read_many([(node_id, index, subindex)], signed=signed)[0]
+
+    def close(self):
+        """Detach from the controller's frame listeners."""
+        self.can_controller.remove_frame_listener(self._on_frame)
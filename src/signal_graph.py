@@ -0,0 +1,327 @@
+import numpy as np
+from scipy.signal import butter, sosfilt, sosfilt_zi, sosfiltfilt
+from utils import butter_lowpass_filter, butter_highpass_filter
+
+# Signals derived from the raw x/y/z axes, in CSV export order
+DERIVED_SIGNALS = ('x_incl', 'y_incl', 'z_incl', 'x_acc', 'y_acc', 'z_acc', 'tetha_xz', 'tetha_yz')
+
+
+class SignalGraph:
+    """
+    Lazy dependency graph of named signals.
+    Each node is computed from its dependencies only when an output needs it, and results
+    are memoized until the data version changes.
+    """
+
+    def __init__(self):
+        self._nodes = {}
+        self._cache = {}
+        self._cache_version = None
+
+    def add(self, name, deps, fn):
+        """
+        Register a node.
+        Args:
+            name: signal name
+            deps: tuple of node or input names passed positionally to fn
+            fn: function(*dep_values) returning the node value
+        """
+        self._nodes[name] = (tuple(deps), fn)
+
+    def names(self):
+        return list(self._nodes)
+
+    def invalidate(self):
+        """Drop all memoized values."""
+        self._cache = {}
+        self._cache_version = None
+
+    def evaluate(self, names, inputs, version=None):
+        """
+        Compute the requested nodes and everything they depend on.
+        Args:
+            names: iterable of node names
+            inputs: dict of source values (e.g. data_points, fs); an input with the same
+                name as a node overrides that node
+            version: hashable key identifying data and parameters; a new key clears the
+                memo, None disables memoization
+        Returns: dict name -> value for the requested names
+        """
+        if version is None or version != self._cache_version:
+            self._cache = {}
+            self._cache_version = version
+        return {name: self._evaluate_node(name, inputs) for name in names}
+
+    def _evaluate_node(self, name, inputs):
+        if name in inputs:
+            return inputs[name]
+        if name in self._cache:
+            return self._cache[name]
+        try:
+            deps, fn = self._nodes[name]
+        except KeyError:
+            raise KeyError(f"Unknown signal '{name}'") from None
+        value = fn(*(self._evaluate_node(dep, inputs) for dep in deps))
+        self._cache[name] = value
+        return value
+
+
+def _lowpass(data, fs, cutoff):
+    return butter_lowpass_filter(data, cutoff, fs)
+
+
+def _highpass(data, fs, cutoff):
+    return butter_highpass_filter(data, cutoff, fs)
+
+
+def _design_sos(fs, cutoff, btype, order):
+    """Return SOS coefficients, or None when the cutoff is not below Nyquist (pass-through)."""
+    nyquist = 0.5 * fs
+    if nyquist == 0 or cutoff >= nyquist:
+        return None
+    return butter(order, cutoff / nyquist, btype=btype, output='sos')
+
+
+def _tilt(a, z):
+    return np.degrees(np.arctan2(a, z))
+
+
+def build_default_graph():
+    """
+    Graph of the inclinometer signals.
+    Inputs: data_points (list of (timestamp, can_id, x, y, z)), fs, cutoff_lowpass, cutoff_highpass.
+    Raw axes may also be given directly as inputs 'x', 'y', 'z' (and 'time').
+    """
+    graph = SignalGraph()
+    graph.add('time', ('data_points',), lambda dp: [p[0] for p in dp])
+    graph.add('x', ('data_points',), lambda dp: np.array([p[2] for p in dp]))
+    graph.add('y', ('data_points',), lambda dp: np.array([p[3] for p in dp]))
+    graph.add('z', ('data_points',), lambda dp: np.array([p[4] for p in dp]))
+    for axis in ('x', 'y', 'z'):
+        graph.add(f'{axis}_incl', (axis, 'fs', 'cutoff_lowpass'), _lowpass)
+        graph.add(f'{axis}_acc', (axis, 'fs', 'cutoff_highpass'), _highpass)
+    graph.add('tetha_xz', ('x_incl', 'z_incl'), _tilt)
+    graph.add('tetha_yz', ('y_incl', 'z_incl'), _tilt)
+    return graph
+
+
+class StreamingSignals:
+    """
+    Chunk-by-chunk counterpart of the default graph for the live ingest path.
+    Filters keep their state between chunks, so each sample is processed exactly once
+    and chunk boundaries leave no trace in the output.
+    """
+
+    def __init__(self, fs, cutoff_lowpass=1.0, cutoff_highpass=1.0, order=5):
+        self.fs = fs
+        self._lowpass = _design_sos(fs, cutoff_lowpass, 'low', order)
+        self._highpass = _design_sos(fs, cutoff_highpass, 'high', order)
+        self._state = {}
+
+    def _filter(self, key, sos, data):
+        if sos is None:
+            return data
+        zi = self._state.get(key)
+        if zi is None:
+            # Start from steady state on the first sample to avoid a startup transient
+            zi = sosfilt_zi(sos) * data[0]
+        out, self._state[key] = sosfilt(sos, data, zi=zi)
+        return out
+
+    def process(self, x, y, z):
+        """
+        Filter one chunk of raw samples.
+        Returns: dict with raw x/y/z and every name in DERIVED_SIGNALS for the chunk
+        """
+        out = {'x': np.asarray(x, dtype=float), 'y': np.asarray(y, dtype=float), 'z': np.asarray(z, dtype=float)}
+        if out['x'].size == 0:
+            empty = np.empty(0)
+            out.update({name: empty for name in DERIVED_SIGNALS})
+            return out
+        for axis in ('x', 'y', 'z'):
+            out[f'{axis}_incl'] = self._filter(f'{axis}_incl', self._lowpass, out[axis])
+            out[f'{axis}_acc'] = self._filter(f'{axis}_acc', self._highpass, out[axis])
+        out['tetha_xz'] = _tilt(out['x_incl'], out['z_incl'])
+        out['tetha_yz'] = _tilt(out['y_incl'], out['z_incl'])
+        return out
+
+
+class NodeStreamingSignals:
+    """
+    StreamingSignals with separate filter state per node, for ingest chunks that interleave
+    samples of several CAN IDs. Each node is filtered as its own continuous signal and the
+    results are put back in chunk order, so one node's samples never enter another's filters.
+    """
+
+    def __init__(self, fs, cutoff_lowpass=1.0, cutoff_highpass=1.0, order=5):
+        self.fs = fs
+        self._filter_args = (fs, cutoff_lowpass, cutoff_highpass, order)
+        self._nodes = {}
+
+    def _node(self, can_id):
+        signals = self._nodes.get(can_id)
+        if signals is None:
+            signals = self._nodes[can_id] = StreamingSignals(*self._filter_args)
+        return signals
+
+    def process(self, can_ids, x, y, z):
+        """
+        Filter one chunk of raw samples from any number of nodes.
+        Args:
+            can_ids: CAN ID of each sample
+            x, y, z: raw samples, same length as can_ids
+        Returns: dict with raw x/y/z and every name in DERIVED_SIGNALS, in chunk order
+        """
+        x, y, z = (np.asarray(v, dtype=float) for v in (x, y, z))
+        if x.size == 0:
+            out = {'x': x, 'y': y, 'z': z}
+            out.update({name: np.empty(0) for name in DERIVED_SIGNALS})
+            return out
+        unique_ids, inverse = np.unique(np.asarray(can_ids), return_inverse=True)
+        if unique_ids.size == 1:
+            return self._node(unique_ids[0].item()).process(x, y, z)
+        # Group sample positions by node with one stable sort, keeping each node's time order
+        order = np.argsort(inverse, kind='stable')
+        groups = np.split(order, np.cumsum(np.bincount(inverse))[:-1])
+        out = None
+        for can_id, idx in zip(unique_ids.tolist(), groups):
+            part = self._node(can_id).process(x[idx], y[idx], z[idx])
+            if out is None:
+                out = {name: np.empty(x.size) for name in part}
+            for name, values in part.items():
+                out[name][idx] = values
+        return out
+
+
+def settling_samples(sos, tol=1e-9, max_samples=1 << 22):
+    """Number of samples after which the filter impulse response stays below tol * its peak."""
+    n = 1024
+    while True:
+        impulse = np.zeros(n)
+        impulse[0] = 1.0
+        h = np.abs(sosfilt(sos, impulse))
+        above = np.flatnonzero(h > tol * h.max())
+        last = int(above[-1]) + 1 if above.size else 1
+        if last < n // 2 or n >= max_samples:
+            return min(last, max_samples)
+        n *= 2
+
+
+class ZeroPhaseFilter:
+    """
+    Forward-backward filtering of an arbitrarily long stream in bounded memory, matching
+    scipy.signal.sosfiltfilt (odd extension, default padlen) on the whole array.
+    The forward pass is causal and runs exactly with carried state. The backward pass of
+    each block starts `margin` samples beyond the block end, by which point the error of
+    its approximate initial state has decayed below tolerance; only the true end of the
+    signal gets the exact edge extension. Output therefore lags the input by ~margin samples.
+    """
+
+    def __init__(self, sos, margin=None, tol=1e-9):
+        self.sos = sos
+        self._zi0 = sosfilt_zi(sos)
+        ntaps = 2 * len(sos) + 1 - min((sos[:, 2] == 0).sum(), (sos[:, 5] == 0).sum())
+        self.padlen = 3 * int(ntaps)
+        self.margin = margin if margin is not None else settling_samples(sos, tol)
+        self.reset()
+
+    def reset(self):
+        self._zi = None
+        self._head = np.empty(0)
+        self._fwd = np.empty(0)
+        self._tail = np.empty(0)
+
+    def process(self, x):
+        """Feed raw samples. Returns the output samples finalized so far (possibly empty)."""
+        x = np.asarray(x, dtype=float)
+        if self._zi is None:
+            self._head = np.concatenate((self._head, x))
+            if len(self._head) <= self.padlen:
+                return np.empty(0)
+            x, self._head = self._head, np.empty(0)
+            # Odd extension before the first sample, as sosfiltfilt does
+            ext = 2 * x[0] - x[self.padlen:0:-1]
+            y, self._zi = sosfilt(self.sos, np.concatenate((ext, x)), zi=self._zi0 * ext[0])
+            y = y[self.padlen:]
+        else:
+            y, self._zi = sosfilt(self.sos, x, zi=self._zi)
+        self._tail = np.concatenate((self._tail, x))[-(self.padlen + 1):]
+        self._fwd = np.concatenate((self._fwd, y))
+        if len(self._fwd) < 2 * self.margin:
+            return np.empty(0)
+        back = self._backward(self._fwd)
+        ready = len(self._fwd) - self.margin
+        self._fwd = self._fwd[ready:]
+        return back[:ready]
+
+    def finish(self):
+        """Flush the remaining samples, applying the end-of-signal edge extension."""
+        if self._zi is None:
+            x, self._head = self._head, np.empty(0)
+            if len(x) < 2:
+                return x
+            return sosfiltfilt(self.sos, x, padlen=min(self.padlen, len(x) - 1))
+        ext = 2 * self._tail[-1] - self._tail[-2:-(self.padlen + 2):-1]
+        y_ext, _ = sosfilt(self.sos, ext, zi=self._zi)
+        n = len(self._fwd)
+        out = self._backward(np.concatenate((self._fwd, y_ext)))[:n]
+        self.reset()
+        return out
+
+    def _backward(self, fwd):
+        y, _ = sosfilt(self.sos, fwd[::-1], zi=self._zi0 * fwd[-1])
+        return y[::-1]
+
+
+class ZeroPhaseSignals:
+    """
+    Export-time counterpart of StreamingSignals: derived signals computed with zero-phase
+    (forward-backward) filters chunk by chunk, so the tilt has no filter delay and memory
+    stays bounded. Outputs lag the inputs; process() returns only aligned, finalized rows.
+    """
+
+    def __init__(self, fs, cutoff_lowpass=1.0, cutoff_highpass=1.0, order=5, tol=1e-9):
+        lowpass = _design_sos(fs, cutoff_lowpass, 'low', order)
+        highpass = _design_sos(fs, cutoff_highpass, 'high', order)
+        # One margin for all filters keeps their outputs aligned
+        margin = max((settling_samples(sos, tol) for sos in (lowpass, highpass) if sos is not None), default=0)
+        self._filters = {}
+        for axis in ('x', 'y', 'z'):
+            for suffix, sos in (('incl', lowpass), ('acc', highpass)):
+                if sos is not None:
+                    self._filters[f'{axis}_{suffix}'] = ZeroPhaseFilter(sos, margin=margin)
+        self._sources = {f'{axis}_{suffix}': axis for axis in ('x', 'y', 'z') for suffix in ('incl', 'acc')}
+        self._pending = {}
+
+    def _push(self, name, values):
+        pending = self._pending.get(name)
+        self._pending[name] = values if pending is None else np.concatenate((pending, values))
+
+    def process(self, x, y, z, extra=None):
+        """
+        Feed one chunk of raw samples.
+        Args:
+            extra: optional dict of additional per-sample arrays (e.g. time, can_id) kept aligned with the output
+        Returns: dict with raw x/y/z, extra columns and DERIVED_SIGNALS for the rows finalized so far
+        """
+        raw = {'x': np.asarray(x, dtype=float), 'y': np.asarray(y, dtype=float), 'z': np.asarray(z, dtype=float)}
+        for name, values in {**raw, **(extra or {})}.items():
+            self._push(name, np.asarray(values))
+        for name, source in self._sources.items():
+            zp = self._filters.get(name)
+            self._push(name, raw[source] if zp is None else zp.process(raw[source]))
+        return self._emit()
+
+    def finish(self):
+        """Return the remaining rows at the end of the signal."""
+        for name, zp in self._filters.items():
+            self._push(name, zp.finish())
+        return self._emit()
+
+    def _emit(self):
+        ready = min(len(values) for values in self._pending.values())
+        out = {name: values[:ready] for name, values in self._pending.items()}
+        self._pending = {name: values[ready:] for name, values in self._pending.items()}
+        out['tetha_xz'] = _tilt(out['x_incl'], out['z_incl'])
+        out['tetha_yz'] = _tilt(out['y_incl'], out['z_incl'])
+        return out
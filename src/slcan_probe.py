@@ -0,0 +1,148 @@
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import serial
+    from serial.tools import list_ports
+except ImportError:
+    serial = None
+    list_ports = None
+
+# USB VID/PID of common SLCAN adapters; only used to order candidates, the probe decides
+SLCAN_USB_IDS = {
+    (0xAD50, 0x60C4): 'CANable (slcan firmware)',
+    (0x04D8, 0x000A): 'USBtin',
+    (0x0403, 0x6001): 'FTDI serial (Lawicel CANUSB)',
+    (0x0483, 0x5740): 'STM32 virtual COM port',
+}
+CACHE_PATH = os.path.join(os.path.expanduser('~'), '.rumiaconfigurator', 'slcan_port.json')
+
+
+class SlcanProbeResult:
+    """An SLCAN adapter that answered the version query."""
+
+    def __init__(self, port, version, serial_number=None):
+        self.port = port
+        self.version = version
+        self.serial_number = serial_number
+
+    @property
+    def device(self):
+        return self.port.device
+
+    def describe(self):
+        name = SLCAN_USB_IDS.get((self.port.vid, self.port.pid), self.port.description or 'SLCAN')
+        text = f"{self.device} ({name}, V{self.version}"
+        if self.serial_number:
+            text += f", N{self.serial_number}"
+        return text + ")"
+
+
+def candidate_ports():
+    """Serial ports, known SLCAN VID/PIDs first."""
+    if list_ports is None:
+        return []
+    ports = list(list_ports.comports())
+    return sorted(ports, key=lambda p: ((p.vid, p.pid) not in SLCAN_USB_IDS, p.device))
+
+
+def _query(conn, command):
+    """Send an SLCAN command and return the reply line without its prefix, or None on timeout/error."""
+    conn.write(command + b'\r')
+    reply = conn.read_until(b'\r')
+    if not reply.endswith(b'\r') or not reply.startswith(command[:1]):
+        return None
+    return reply[1:-1].decode('ascii', errors='replace')
+
+
+def probe_port(port, timeout=0.3, baudrate=115200):
+    """
+    Ask one serial port for its SLCAN version ('V') and serial number ('N').
+    Returns: SlcanProbeResult, or None if the port is busy or did not answer like an SLCAN adapter
+    """
+    try:
+        with serial.Serial(port.device, baudrate, timeout=timeout, write_timeout=timeout) as conn:
+            # Empty commands terminate any partial line left in the adapter's buffer
+            conn.write(b'\r\r\r')
+            conn.reset_input_buffer()
+            version = _query(conn, b'V')
+            if version is None:
+                return None
+            return SlcanProbeResult(port, version, _query(conn, b'N'))
+    except (OSError, serial.SerialException, ValueError):
+        return None
+
+
+def load_cached_port(path=CACHE_PATH):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_cached_port(result, path=CACHE_PATH):
+    entry = {
+        'device': result.device,
+        'vid': result.port.vid,
+        'pid': result.port.pid,
+        'usb_serial': result.port.serial_number,
+        'version': result.version,
+    }
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(entry, f)
+    except OSError:
+        pass
+
+
+def _cached_candidate(ports, cached):
+    """Return the port matching the cached adapter (by USB serial number, else device name)."""
+    if not cached:
+        return None
+    for port in ports:
+        if cached.get('usb_serial') and port.serial_number == cached['usb_serial'] \
+                and (port.vid, port.pid) == (cached.get('vid'), cached.get('pid')):
+            return port
+    for port in ports:
+        if port.device == cached.get('device'):
+            return port
+    return None
+
+
+def discover_slcan_port(timeout=0.3, use_cache=True, log_callback=None):
+    """
+    Find an SLCAN adapter among the serial ports.
+    The cached adapter of this machine is checked first; otherwise all candidate ports are
+    probed concurrently, so discovery takes about one timeout regardless of the number of ports.
+    Returns: SlcanProbeResult or None
+    """
+    log_callback = log_callback or print
+    if serial is None:
+        log_callback("pyserial not available: cannot probe serial ports.")
+        return None
+    ports = candidate_ports()
+    if not ports:
+        return None
+
+    if use_cache:
+        cached = _cached_candidate(ports, load_cached_port())
+        if cached is not None:
+            result = probe_port(cached, timeout)
+            if result is not None:
+                return result
+            ports = [p for p in ports if p.device != cached.device]
+            if not ports:
+                return None
+
+    with ThreadPoolExecutor(max_workers=len(ports)) as pool:
+        results = [r for r in pool.map(lambda p: probe_port(p, timeout), ports) if r is not None]
+    if not results:
+        return None
+    if len(results) > 1:
+        log_callback("Più adattatori SLCAN trovati: " + ', '.join(r.describe() for r in results))
+    result = results[0]
+    save_cached_port(result)
+    return result
@@ -0,0 +1,205 @@
+import os
+import select
+import socket
+import struct
+import threading
+import time
+
+# struct can_frame (linux/can.h): u32 can_id, u8 len, 3 bytes padding/reserved, u8 data[8]
+CAN_FRAME_STRUCT = struct.Struct("=IB3x8s")
+CAN_FRAME_SIZE = CAN_FRAME_STRUCT.size
+
+CAN_EFF_FLAG = 0x80000000
+CAN_RTR_FLAG = 0x40000000
+CAN_ERR_FLAG = 0x20000000
+CAN_SFF_MASK = 0x000007FF
+CAN_EFF_MASK = 0x1FFFFFFF
+
+# struct timeval delivered as SO_TIMESTAMP ancillary data
+_TIMEVAL_STRUCT = struct.Struct("@ll")
+_SO_TIMESTAMP = getattr(socket, 'SO_TIMESTAMP', 29)
+# Receive every class of error frame (linux/can/raw.h, linux/can/error.h)
+_SOL_CAN_RAW = getattr(socket, 'SOL_CAN_RAW', 101)
+_CAN_RAW_ERR_FILTER = getattr(socket, 'CAN_RAW_ERR_FILTER', 2)
+_CAN_ERR_MASK = 0x1FFFFFFF
+
+
+def is_available():
+    """Return True if raw AF_CAN sockets are supported by this Python/OS."""
+    return hasattr(socket, 'AF_CAN') and hasattr(socket, 'CAN_RAW')
+
+
+def interface_exists(can_interface):
+    """Return True if the network interface (e.g. 'can0') is already present."""
+    return os.path.exists(os.path.join('/sys/class/net', can_interface))
+
+
+def pack_frame(arbitration_id, data, is_extended_id=False):
+    """Build a struct can_frame from an arbitration ID and up to 8 data bytes."""
+    if len(data) > 8:
+        raise ValueError("CAN frame data must be at most 8 bytes.")
+    can_id = arbitration_id & (CAN_EFF_MASK if is_extended_id else CAN_SFF_MASK)
+    if is_extended_id:
+        can_id |= CAN_EFF_FLAG
+    return CAN_FRAME_STRUCT.pack(can_id, len(data), bytes(data).ljust(8, b'\x00'))
+
+
+def unpack_frame(frame):
+    """
+    Decode a struct can_frame.
+    Returns: (arbitration_id, data, is_error, is_extended_id)
+    """
+    can_id, dlc, payload = CAN_FRAME_STRUCT.unpack_from(frame)
+    is_error = bool(can_id & CAN_ERR_FLAG)
+    is_extended_id = bool(can_id & CAN_EFF_FLAG)
+    arbitration_id = can_id & (CAN_EFF_MASK if is_extended_id else CAN_SFF_MASK)
+    return arbitration_id, payload[:min(dlc, 8)], is_error, is_extended_id
+
+
+class SocketCanBus:
+    """
+    Minimal SocketCAN bus on a raw AF_CAN socket (Linux only).
+    Frames are read and written as struct can_frame, without can-utils subprocesses.
+    A pre-built datagram socket (e.g. one end of socket.socketpair) can be passed
+    as `sock` to exercise the backend without CAN hardware.
+    """
+
+    def __init__(self, channel='can0', sock=None):
+        """
+        Args:
+            channel: SocketCAN interface name (e.g. 'can0')
+            sock: optional already-connected datagram socket used instead of AF_CAN
+        """
+        self.channel = channel
+        if sock is None:
+            sock = socket.socket(socket.AF_CAN, socket.SOCK_RAW, socket.CAN_RAW)
+            try:
+                sock.bind((channel,))
+            except OSError:
+                sock.close()
+                raise
+            try:
+                sock.setsockopt(_SOL_CAN_RAW, _CAN_RAW_ERR_FILTER, struct.pack('=I', _CAN_ERR_MASK))
+            except OSError:
+                pass
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, _SO_TIMESTAMP, 1)
+        except OSError:
+            pass
+        self.sock = sock
+        self.error_frames = 0
+        self._ancbufsize = socket.CMSG_SPACE(_TIMEVAL_STRUCT.size)
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def send(self, arbitration_id, data, is_extended_id=False):
+        """Write a single frame to the bus."""
+        self.sock.send(pack_frame(arbitration_id, data, is_extended_id))
+
+    def send_many(self, frames):
+        """
+        Write several frames back to back on the persistent socket.
+        Args:
+            frames: iterable of (arbitration_id, data) tuples
+        Returns: number of frames written
+        """
+        count = 0
+        for arbitration_id, data in frames:
+            self.sock.send(pack_frame(arbitration_id, data))
+            count += 1
+        return count
+
+    def send_periodic(self, arbitration_id, data, period, duration=None):
+        """
+        Start cyclic transmission of one frame from a background thread.
+        Args:
+            period: seconds between frames
+            duration: optional total seconds after which the task stops by itself
+        Returns: task object with a stop() method
+        """
+        task = PeriodicSendTask(self.sock, pack_frame(arbitration_id, data), period, duration)
+        task.start()
+        return task
+
+    def recv_batch(self, timeout=1.0, max_frames=256):
+        """
+        Wait up to `timeout` seconds for traffic, then drain every frame already queued
+        in the socket (up to max_frames) without blocking again.
+        Returns: list of (timestamp, arbitration_id, data, is_extended_id); timestamp is the
+        kernel receive time in seconds since the epoch when available. Error frames are not
+        returned, only counted in error_frames.
+        """
+        readable, _, _ = select.select([self.sock], [], [], timeout)
+        if not readable:
+            return []
+        frames = []
+        while len(frames) < max_frames:
+            try:
+                frame, ancdata, _, _ = self.sock.recvmsg(CAN_FRAME_SIZE, self._ancbufsize, socket.MSG_DONTWAIT)
+            except (BlockingIOError, InterruptedError):
+                break
+            if len(frame) < CAN_FRAME_SIZE:
+                continue
+            arbitration_id, data, is_error, is_extended_id = unpack_frame(frame)
+            if is_error:
+                self.error_frames += 1
+                continue
+            frames.append((self._timestamp(ancdata), arbitration_id, data, is_extended_id))
+        return frames
+
+    def _timestamp(self, ancdata):
+        """Extract the SO_TIMESTAMP value from ancillary data, or fall back to now."""
+        for level, ctype, cdata in ancdata:
+            if level == socket.SOL_SOCKET and ctype == _SO_TIMESTAMP and len(cdata) >= _TIMEVAL_STRUCT.size:
+                sec, usec = _TIMEVAL_STRUCT.unpack_from(cdata)
+                return sec + usec / 1e6
+        return time.time()
+
+    def shutdown(self):
+        """Close the underlying socket."""
+        self.sock.close()
+
+
+class PeriodicSendTask:
+    """
+    Cyclic sender for the native backend, mirroring python-can's send_periodic task API.
+    Deadlines are scheduled on the monotonic clock so the period does not drift.
+    """
+
+    def __init__(self, sock, frame, period, duration=None):
+        if period <= 0:
+            raise ValueError("Period must be positive.")
+        self.sock = sock
+        self.frame = frame
+        self.period = period
+        self.duration = duration
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def _run(self):
+        start = time.monotonic()
+        next_deadline = start
+        while not self._stop_event.is_set():
+            if self.duration is not None and next_deadline - start >= self.duration:
+                break
+            try:
+                self.sock.send(self.frame)
+            except OSError:
+                break
+            next_deadline += self.period
+            delay = next_deadline - time.monotonic()
+            if delay < 0:
+                # Fell behind (e.g. TX queue full): resync instead of bursting
+                next_deadline = time.monotonic()
+                delay = 0
+            self._stop_event.wait(delay)
+
+    def stop(self):
+        """Stop transmitting and wait for the thread to exit."""
+        self._stop_event.set()
+        if self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
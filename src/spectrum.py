@@ -0,0 +1,164 @@
+from collections import deque
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import get_window
+
+# Signals shown in the spectrum panel (high-pass vibration components)
+SPECTRUM_SIGNALS = (('x_acc', 'x_acc'), ('y_acc', 'y_acc'), ('z_acc', 'z_acc'))
+
+
+def default_segment_length(fs):
+    """Power-of-two Welch segment covering about 2 s of data, bounded to 32-1024 samples."""
+    target = max(1, int(fs * 2))
+    length = 1 << (target - 1).bit_length()
+    return min(1024, max(32, length))
+
+
+class WelchAccumulator:
+    """
+    Incremental Welch PSD over a sliding window of segments.
+    Samples are buffered until a full segment is available; each new segment is
+    windowed and transformed once with a vectorized rfft, and the average over the
+    last `max_segments` segments is kept as a running sum. Memory and per-sample cost
+    are bounded regardless of how long acquisition runs.
+    """
+
+    def __init__(self, fs, nperseg=256, overlap=0.5, max_segments=32):
+        """
+        Args:
+            fs: sampling frequency in Hz
+            nperseg: samples per segment
+            overlap: fraction of overlap between consecutive segments (0 <= overlap < 1)
+            max_segments: number of most recent segments averaged into the PSD
+        """
+        self.fs = fs
+        self.nperseg = nperseg
+        self.hop = max(1, int(nperseg * (1 - overlap)))
+        self.max_segments = max_segments
+        self.window = get_window('hann', nperseg)
+        # One-sided PSD density scaling (same convention as scipy.signal.welch)
+        self.scale = np.full(nperseg // 2 + 1, 2.0 / (fs * np.sum(self.window ** 2)))
+        self.scale[0] /= 2
+        if nperseg % 2 == 0:
+            self.scale[-1] /= 2
+        self.freqs = np.fft.rfftfreq(nperseg, d=1.0 / fs)
+        self.reset()
+
+    def reset(self):
+        self._pending = np.empty(0)
+        self._segments = deque()
+        self._sum = np.zeros(self.nperseg // 2 + 1)
+
+    def push(self, samples):
+        """Add new samples; processes only the segments they complete."""
+        samples = np.asarray(samples, dtype=float)
+        if samples.size:
+            self._pending = np.concatenate((self._pending, samples))
+        if self._pending.size < self.nperseg:
+            return
+        segments = sliding_window_view(self._pending, self.nperseg)[::self.hop]
+        consumed = len(segments) * self.hop
+        # Only the newest max_segments can contribute to the average
+        segments = segments[-self.max_segments:]
+        segments = segments - segments.mean(axis=1, keepdims=True)
+        spectra = np.abs(np.fft.rfft(segments * self.window, axis=1)) ** 2 * self.scale
+        for psd in spectra:
+            self._segments.append(psd)
+            self._sum += psd
+            if len(self._segments) > self.max_segments:
+                self._sum -= self._segments.popleft()
+        self._pending = self._pending[consumed:]
+
+    def psd(self):
+        """Return (freqs, psd) averaged over the current window, or None before the first segment."""
+        if not self._segments:
+            return None
+        return self.freqs, self._sum / len(self._segments)
+
+
+class SpectrumManager:
+    """
+    Live PSD panel for the *_acc signals, rendered on its own matplotlib axes.
+    Each node gets its own accumulators, since the chunks interleave samples of all CAN IDs
+    and the frequency axis is that of a single node; the panel shows one node at a time.
+    """
+
+    def __init__(self, ax, canvas, max_segments=32):
+        """
+        Args:
+            ax: matplotlib Axes object
+            canvas: FigureCanvasTkAgg object
+            max_segments: Welch segments averaged in the sliding window
+        """
+        self.ax = ax
+        self.canvas = canvas
+        self.max_segments = max_segments
+        self.sampling_frequency = 0
+        # CAN ID -> {signal name -> WelchAccumulator}, in the order nodes were first seen
+        self.accumulators = {}
+
+    def reset(self, sampling_frequency):
+        """Start a new spectrum for an acquisition at the given (per-node) sampling frequency."""
+        self.sampling_frequency = sampling_frequency
+        self.accumulators = {}
+        self.clear_plot()
+
+    def _node_accumulators(self, can_id):
+        accumulators = self.accumulators.get(can_id)
+        if accumulators is None:
+            nperseg = default_segment_length(self.sampling_frequency)
+            accumulators = self.accumulators[can_id] = {
+                name: WelchAccumulator(self.sampling_frequency, nperseg=nperseg, max_segments=self.max_segments)
+                for name, _ in SPECTRUM_SIGNALS
+            }
+        return accumulators
+
+    def push(self, chunk, can_ids):
+        """
+        Feed one chunk of streaming signals.
+        Args:
+            chunk: dict name -> array
+            can_ids: CAN ID of each sample of the chunk
+        """
+        if self.sampling_frequency <= 0 or not len(can_ids):
+            return
+        unique_ids, inverse = np.unique(np.asarray(can_ids), return_inverse=True)
+        order = np.argsort(inverse, kind='stable')
+        groups = np.split(order, np.cumsum(np.bincount(inverse))[:-1])
+        for can_id, idx in zip(unique_ids.tolist(), groups):
+            for name, acc in self._node_accumulators(can_id).items():
+                values = chunk.get(name)
+                if values is not None and len(values):
+                    acc.push(np.asarray(values)[idx])
+
+    def clear_plot(self):
+        self.ax.clear()
+        self._apply_plot_styling()
+        self.canvas.draw()
+
+    def plot(self, can_id=None):
+        """
+        Redraw the averaged spectra of one node (default: the first node seen).
+        Returns False if no segment is complete yet.
+        """
+        if can_id is None and self.accumulators:
+            can_id = next(iter(self.accumulators))
+        accumulators = self.accumulators.get(can_id, {})
+        results = [(label, accumulators[name].psd()) for name, label in SPECTRUM_SIGNALS if name in accumulators]
+        results = [(label, r) for label, r in results if r is not None]
+        if not results:
+            return False
+        self.ax.clear()
+        for label, (freqs, psd) in results:
+            # Skip the DC bin so the log scale is not dominated by it
+            self.ax.semilogy(freqs[1:], psd[1:], label=label)
+        self._apply_plot_styling(can_id)
+        self.ax.legend(fontsize='small', loc='upper right', facecolor='#363636', labelcolor='white')
+        self.canvas.draw()
+        return True
+
+    def _apply_plot_styling(self, can_id=None):
+        self.ax.set_title('PSD (Welch)' if can_id is None else f'PSD (Welch) - {can_id}', color='white')
+        self.ax.set_xlabel('Frequency [Hz]', color='white')
+        self.ax.set_ylabel('PSD [g^2/Hz]', color='white')
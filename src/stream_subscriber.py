@@ -0,0 +1,65 @@
+"""
+RumiaConfigurator - reference sample stream subscriber
+Connects to the sample stream published by the GUI and prints the received samples,
+or appends them to a CSV file.
+
+Usage:
+    python stream_subscriber.py [127.0.0.1:5555 | /path/to/socket] [--csv out.csv] [--quiet]
+"""
+
+import argparse
+import csv
+import datetime
+import sys
+import time
+
+from sample_stream import connect, read_frames
+from utils import CSV_TIMESTAMP_FORMAT
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Subscribe to the RumiaConfigurator sample stream.")
+    parser.add_argument('address', nargs='?', default='127.0.0.1:5555', help="host:port or Unix socket path")
+    parser.add_argument('--csv', help="append received samples to this CSV file")
+    parser.add_argument('--quiet', action='store_true', help="only print a rate summary every second")
+    args = parser.parse_args(argv)
+
+    try:
+        sock = connect(args.address)
+    except OSError as e:
+        print(f"Cannot connect to {args.address}: {e}")
+        return 1
+    print(f"Connected to {args.address}")
+
+    csvfile = open(args.csv, 'a', newline='') if args.csv else None
+    csv_writer = csv.writer(csvfile) if csvfile else None
+    received = 0
+    last_report = time.monotonic()
+    try:
+        for frame in read_frames(sock):
+            received += len(frame)
+            if csv_writer is not None or not args.quiet:
+                for t, can_id, x, y, z in frame.tolist():
+                    timestamp = datetime.datetime.fromtimestamp(t).strftime(CSV_TIMESTAMP_FORMAT)
+                    row = [timestamp, f"{can_id:X}", f"{x:.3f}", f"{y:.3f}", f"{z:.3f}"]
+                    if csv_writer is not None:
+                        csv_writer.writerow(row)
+                    if not args.quiet:
+                        print(' '.join(row))
+            now = time.monotonic()
+            if args.quiet and now - last_report >= 1.0:
+                print(f"{received / (now - last_report):.1f} samples/s")
+                received = 0
+                last_report = now
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sock.close()
+        if csvfile is not None:
+            csvfile.close()
+    print("Disconnected.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
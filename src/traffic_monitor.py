@@ -0,0 +1,85 @@
+import time
+
+# Frame length in bits by DLC, without bit stuffing (which adds up to ~20% in the worst case):
+# SOF + arbitration + control + data + CRC + ACK + EOF + 3 bit interframe space
+_STD_FRAME_BITS = tuple(47 + 8 * dlc for dlc in range(9))
+_EXT_FRAME_BITS = tuple(67 + 8 * dlc for dlc in range(9))
+
+
+class TrafficMonitor:
+    """
+    Per-arbitration-ID frame counters and bus load estimate.
+    record() is called by the reader thread for every frame and only touches a dict entry
+    and an integer; rates and load are derived when the GUI takes a snapshot, from the
+    difference with the previous snapshot. Standard and extended frames are told apart by
+    the IDE flag of the frame, not by the ID value, and counted under separate keys.
+    """
+
+    def __init__(self, bitrate=1000000):
+        """
+        Args:
+            bitrate: nominal bus bitrate in bit/s, used for the load percentage
+        """
+        self.bitrate = bitrate
+        self.reset()
+
+    def reset(self):
+        self.counts = {}
+        self.bits = 0
+        self.error_frames = 0
+        self.ignored_frames = 0
+        self.unparsed_frames = 0
+        self._start = time.monotonic()
+        self._last_time = self._start
+        self._last_counts = {}
+        self._last_bits = 0
+
+    def record(self, arbitration_id, dlc, is_extended_id=False):
+        """Count one received frame (reader thread)."""
+        key = (arbitration_id, is_extended_id)
+        counts = self.counts
+        counts[key] = counts.get(key, 0) + 1
+        self.bits += (_EXT_FRAME_BITS if is_extended_id else _STD_FRAME_BITS)[min(dlc, 8)]
+
+    def snapshot(self):
+        """
+        Return the counters and the rates since the previous snapshot.
+        Returns: dict with elapsed, total_frames, bus_load (%), error/ignored/unparsed frame
+            counts and ids: list of (arbitration_id, is_extended_id, count, rate in frames/s),
+            standard IDs first, sorted by ID
+        """
+        now = time.monotonic()
+        counts = dict(self.counts)
+        bits = self.bits
+        interval = max(now - self._last_time, 1e-6)
+        ids = [
+            (arbitration_id, is_extended_id, count,
+             (count - self._last_counts.get((arbitration_id, is_extended_id), 0)) / interval)
+            for (arbitration_id, is_extended_id), count in sorted(counts.items(), key=lambda item: (item[0][1], item[0][0]))
+        ]
+        bus_load = 100.0 * (bits - self._last_bits) / (self.bitrate * interval) if self.bitrate else 0.0
+        self._last_time, self._last_counts, self._last_bits = now, counts, bits
+        return {
+            'elapsed': now - self._start,
+            'total_frames': sum(counts.values()),
+            'bus_load': bus_load,
+            'error_frames': self.error_frames,
+            'ignored_frames': self.ignored_frames,
+            'unparsed_frames': self.unparsed_frames,
+            'ids': ids,
+        }
+
+    def format_table(self, snapshot=None):
+        """Format a snapshot as fixed-width text for the GUI."""
+        snapshot = snapshot or self.snapshot()
+        lines = [
+            f"Bus load {snapshot['bus_load']:5.1f}% @ {self.bitrate // 1000} kbit/s   "
+            f"frames {snapshot['total_frames']}   errors {snapshot['error_frames']}   "
+            f"ignored {snapshot['ignored_frames']}   unparsed {snapshot['unparsed_frames']}",
+            f"{'CAN ID':<10}{'Frames':>10}{'Rate [Hz]':>12}",
+        ]
+        for arbitration_id, is_extended_id, count, rate in snapshot['ids']:
+            # Usual notation: 3 hex digits for standard IDs, 8 for extended ones
+            can_id = f"{arbitration_id:08X}" if is_extended_id else f"{arbitration_id:03X}"
+            lines.append(f"{can_id:<10}{count:>10}{rate:>12.1f}")
+        return '\n'.join(lines)
@@ -4,6 +4,15 @@ import datetime
 import re
 from scipy.signal import butter, lfilter
 
+# Column layout of exported sample CSV files (live export, event files, batch reprocessing)
+CSV_HEADER = [
+    'Timestamp', 'CAN ID', 'x [g]', 'y [g]', 'z [g]',
+    'x_incl [g]', 'y_incl [g]', 'z_incl [g]',
+    'x_acc [g]', 'y_acc [g]', 'z_acc [g]',
+    'Tetha_XZ [deg]', 'Tetha_YZ [deg]'
+]
+CSV_TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
 def resource_path(relative_path):
     """
     Return path to resource, works for development and PyInstaller bundles.
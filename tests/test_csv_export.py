@@ -0,0 +1,65 @@
+import datetime
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from chunk_store import ChunkStoreReader, ChunkStoreWriter  # noqa: E402
+from csv_export import export_rows, memory_blocks, recording_blocks  # noqa: E402
+from utils import CSV_TIMESTAMP_FORMAT  # noqa: E402
+
+FS = 50.0
+
+
+def _acquisition(seconds=30):
+    """Two interleaved nodes with values on the recording's 1/1000 grid."""
+    rng = np.random.default_rng(0)
+    t0 = datetime.datetime(2026, 1, 1, 12, 0, 0)
+    points = []
+    for i in range(int(seconds * FS)):
+        for node, offset_us, tilt in (('19D', 0, 0.0), ('29E', 700, 0.5)):
+            ts = t0 + datetime.timedelta(microseconds=int(i * 1e6 / FS) + offset_us)
+            x, y = np.round(tilt + 0.01 * rng.normal(size=2), 3)
+            points.append((ts, node, float(x), float(y), 1.0))
+    return points
+
+
+def _record(points, directory):
+    # Short chunks so the recording is read back in several blocks
+    writer = ChunkStoreWriter(str(directory), chunk_seconds=7, metadata={'sampling_frequency': FS})
+    for start in range(0, len(points), 97):
+        writer.append(points[start:start + 97])
+    writer.close()
+    return ChunkStoreReader(str(directory)), writer.session
+
+
+@pytest.mark.parametrize('zero_phase', [False, True])
+def test_memory_and_recording_exports_match(tmp_path, zero_phase):
+    points = _acquisition()
+    reader, session = _record(points, tmp_path / 'rec')
+    from_memory = list(export_rows(memory_blocks(points, by_node=zero_phase, block_size=211), FS, 1.0, 1.0, zero_phase))
+    from_disk = list(export_rows(recording_blocks(reader, session, by_node=zero_phase), FS, 1.0, 1.0, zero_phase))
+
+    assert len(from_memory) == len(from_disk) == len(points)
+    assert [row[:2] for row in from_memory] == [row[:2] for row in from_disk]
+    np.testing.assert_allclose(
+        np.array([row[2:] for row in from_memory], dtype=float),
+        np.array([row[2:] for row in from_disk], dtype=float),
+        rtol=0, atol=1e-9,
+    )
+
+
+def test_causal_export_keeps_time_order_and_filters_per_node():
+    points = _acquisition()
+    rows = list(export_rows(memory_blocks(points, block_size=211), FS, 1.0, 1.0))
+
+    assert [row[:2] for row in rows] == [
+        [p[0].strftime(CSV_TIMESTAMP_FORMAT), p[1]] for p in points
+    ]
+    # tetha_xz of each node stays at its own tilt from the first sample on
+    tilt = {'19D': 0.0, '29E': np.degrees(np.arctan(0.5))}
+    for row in rows:
+        assert abs(row[-2] - tilt[row[1]]) < 2.0